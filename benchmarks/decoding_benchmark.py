@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from src.api.decoding import decode
+from src.api.generators import LocalFileWriter, OpenAPIGenerator
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+RESPONSES = FIXTURES_DIR / "responses"
+
+FIXTURES = {
+    "character_movement.json": "CharacterMovementResponseSchema",
+    "items_page.json": "DataPageItemSchema",
+}
+
+
+def generate_models(directory: Path) -> object:
+    # Models come from the bundled spec, not whatever src/api/models holds
+    openapi = json.loads((FIXTURES_DIR / "openapi.json").read_text())
+    generator = OpenAPIGenerator(
+        openapi,
+        LocalFileWriter(),
+        str(directory / "benchmark_models"),
+        str(directory / "benchmark_endpoints"),
+    )
+    asyncio.run(generator.generate_models())
+    sys.path.insert(0, str(directory))
+    return importlib.import_module("benchmark_models")
+
+
+MODES = {
+    "json + validate": lambda content, model: model.model_validate(json.loads(content)),
+    "validate_json": lambda content, model: decode(content, model),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark response decoding modes")
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    results = dict()
+    with tempfile.TemporaryDirectory() as directory:
+        models = generate_models(Path(directory))
+        for fixture, model_name in FIXTURES.items():
+            model = getattr(models, model_name)
+            content = (RESPONSES / fixture).read_bytes()
+            for decode_mode in MODES.values():  # Build validators and caches up front
+                decode_mode(content, model)
+            results[fixture] = {
+                mode: min(
+                    timeit.repeat(
+                        lambda: decode_mode(content, model),
+                        number=args.number,
+                        repeat=5,
+                    )
+                )
+                / args.number
+                for mode, decode_mode in MODES.items()
+            }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for fixture, result in results.items():
+        print(fixture)
+        for mode, seconds in result.items():
+            print(f"    {mode:<16} {seconds * 1e6:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
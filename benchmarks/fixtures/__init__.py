@@ -0,0 +1,3 @@
+from .spec import build_spec
+
+__all__ = ["build_spec"]
@@ -0,0 +1,147 @@
+from typing import Any
+
+
+def _ref(name: str) -> dict[str, str]:
+    return {"$ref": f"#/components/schemas/{name}"}
+
+
+# A deterministic spec shaped like the ArtifactsMMO openapi.json, but much larger
+def build_spec(
+    schemas: int = 1500, paths: int = 400, shallow: bool = False
+) -> dict[str, Any]:
+    components: dict[str, Any] = {
+        "ActionType": {
+            "title": "ActionType",
+            "type": "string",
+            "enum": ["movement", "fight", "gathering", "crafting", "deposit"],
+        }
+    }
+    for i in range(schemas):
+        properties: dict[str, Any] = {
+            "code": {"type": "string"},
+            "level": {"type": "integer"},
+            "tradeable": {"type": "boolean"},
+            "expiration": {"type": "string", "format": "date-time"},
+            "reason": _ref("ActionType"),
+        }
+        if shallow:
+            # References within blocks of 8 schemas, so importing one model
+            # pulls in about as many others as in the real spec
+            for j in range(1, 3):
+                if i % 8 >= j:
+                    properties[f"child_{j}"] = {
+                        "anyOf": [_ref(f"Item{i - j}Schema"), {"type": "null"}]
+                    }
+            if i % 8 >= 4:
+                properties["items"] = {
+                    "type": "array",
+                    "items": _ref(f"Item{i - 4}Schema"),
+                }
+        else:
+            # References to earlier schemas, as nested models do
+            for j in range(1, 6):
+                if i >= j:
+                    properties[f"child_{j}"] = {
+                        "anyOf": [_ref(f"Item{i - j}Schema"), {"type": "null"}]
+                    }
+            if i >= 10:
+                properties["items"] = {
+                    "type": "array",
+                    "items": _ref(f"Item{i - 10}Schema"),
+                }
+        components[f"Item{i}Schema"] = {
+            "title": f"Item{i}Schema",
+            "type": "object",
+            "properties": properties,
+        }
+        components[f"Item{i}ResponseSchema"] = {
+            "title": f"Item{i}ResponseSchema",
+            "type": "object",
+            "properties": {"data": _ref(f"Item{i}Schema")},
+        }
+        if i % 5 == 0:
+            components[f"DataPage_Item{i}Schema_"] = {
+                "title": f"DataPage[Item{i}Schema]",
+                "type": "object",
+                "properties": {
+                    "data": {"type": "array", "items": _ref(f"Item{i}Schema")},
+                    **{
+                        field: {"anyOf": [{"type": "integer"}, {"type": "null"}]}
+                        for field in ("total", "page", "size", "pages")
+                    },
+                },
+            }
+
+    endpoints: dict[str, Any] = {}
+    for i in range(paths):
+        item = i * schemas // paths
+        tag = f"Tag Group {i % 25}"
+        if i % 2:
+            endpoints[f"/my/{{name}}/action/item{i}"] = {
+                "post": {
+                    "tags": [tag],
+                    "summary": f"Action Item {i}",
+                    "description": f"Run action {i}.",
+                    "parameters": [
+                        {
+                            "name": "name",
+                            "in": "path",
+                            "required": True,
+                            "schema": {"type": "string"},
+                        }
+                    ],
+                    "requestBody": {
+                        "content": {
+                            "application/json": {"schema": _ref(f"Item{item}Schema")}
+                        }
+                    },
+                    "responses": {
+                        "200": {
+                            "description": "Action done.",
+                            "content": {
+                                "application/json": {
+                                    "schema": _ref(f"Item{item}ResponseSchema")
+                                }
+                            },
+                        },
+                        "499": {"description": "Character in cooldown."},
+                    },
+                }
+            }
+        else:
+            page = item - item % 5
+            endpoints[f"/items{i}"] = {
+                "get": {
+                    "tags": [tag],
+                    "summary": f"Get All Items {i}",
+                    "description": f"Fetch items {i}.",
+                    "parameters": [
+                        {
+                            "name": parameter,
+                            "in": "query",
+                            "required": False,
+                            "schema": {
+                                "anyOf": [{"type": "integer"}, {"type": "null"}]
+                            },
+                        }
+                        for parameter in ("min_level", "max_level", "page", "size")
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "Successfully fetched items.",
+                            "content": {
+                                "application/json": {
+                                    "schema": _ref(f"DataPage_Item{page}Schema_")
+                                }
+                            },
+                        }
+                    },
+                }
+            }
+
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "ArtifactsMMO benchmark fixture", "version": "0"},
+        "paths": endpoints,
+        "components": {"schemas": components},
+    }
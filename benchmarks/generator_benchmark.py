@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import json
+import logging
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from benchmarks.fixtures import build_spec
+from src.api.generators import OpenAPIGenerator
+
+
+class MemoryFileWriter:
+    def __init__(self) -> None:
+        self.files: dict[str, str] = {}
+
+    def write(self, file_path: str, content: str) -> None:
+        self.files[file_path] = content
+
+    def delete(self, file_path: str) -> None:
+        self.files.pop(file_path, None)
+
+    def read(self, file_path: str) -> str | None:
+        return self.files.get(file_path)
+
+    def exists(self, file_path: str) -> bool:
+        return file_path in self.files
+
+
+async def run_stages(openapi: Any) -> dict[str, float]:
+    timings = dict()
+    started = time.perf_counter()
+    generator = OpenAPIGenerator(
+        openapi, MemoryFileWriter(), "/benchmark/models", "/benchmark/endpoints"
+    )
+    timings["init"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await generator.generate_models()
+    timings["models"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await generator.generate_endpoints()
+    timings["endpoints"] = time.perf_counter() - started
+    return timings
+
+
+async def run(openapi: Any, repeat: int) -> dict[str, dict[str, float]]:
+    results = dict()
+    for _ in range(repeat):
+        for stage, seconds in (await run_stages(openapi)).items():
+            result = results.setdefault(stage, {"seconds": float("inf")})
+            result["seconds"] = min(result["seconds"], seconds)
+
+    # Allocations are traced in a separate pass, tracing slows every stage down
+    tracemalloc.start()
+    snapshots = [tracemalloc.take_snapshot()]
+    generator = OpenAPIGenerator(
+        openapi, MemoryFileWriter(), "/benchmark/models", "/benchmark/endpoints"
+    )
+    snapshots.append(tracemalloc.take_snapshot())
+    await generator.generate_models()
+    snapshots.append(tracemalloc.take_snapshot())
+    await generator.generate_endpoints()
+    snapshots.append(tracemalloc.take_snapshot())
+    tracemalloc.stop()
+
+    for stage, before, after in zip(results, snapshots, snapshots[1:]):
+        statistics = after.compare_to(before, "filename")
+        results[stage]["allocated_kib"] = (
+            sum(stat.size_diff for stat in statistics if stat.size_diff > 0) / 1024
+        )
+        results[stage]["allocations"] = sum(
+            stat.count_diff for stat in statistics if stat.count_diff > 0
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the OpenAPI generator")
+    parser.add_argument("--spec", help="Path to an openapi.json instead of the fixture")
+    parser.add_argument("--schemas", type=int, default=1500)
+    parser.add_argument("--paths", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    openapi = (
+        json.loads(Path(args.spec).read_bytes())
+        if args.spec
+        else build_spec(args.schemas, args.paths)
+    )
+    results = asyncio.run(run(openapi, args.repeat))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for stage, result in results.items():
+        print(
+            f"{stage:<10} {result['seconds'] * 1000:10.1f} ms "
+            f"{result['allocated_kib']:10.1f} KiB retained "
+            f"{result['allocations']:8d} allocations"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import json
+import logging
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.fixtures import build_spec
+from src.api.generators import LocalFileWriter, OpenAPIGenerator
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Each scenario runs in a fresh interpreter and prints its own elapsed seconds
+SCENARIOS = {
+    "import": "import {package}",
+    "import + one model": "from {package} import Item0ResponseSchema",
+    "import + one validation": (
+        "from {package} import Item0ResponseSchema\n"
+        "Item0ResponseSchema.model_validate({{'data': {{'code': 'a', 'level': 1, "
+        "'tradeable': True, 'expiration': 'now', 'reason': 'fight'}}}})"
+    ),
+}
+
+
+def build_packages(directory: Path, schemas: int) -> None:
+    generator = OpenAPIGenerator(
+        build_spec(schemas, 0, shallow=True),
+        LocalFileWriter(),
+        str(directory / "lazy_models"),
+        str(directory / "lazy_endpoints"),
+    )
+    asyncio.run(generator.generate_models())
+
+    # The eager package mirrors the previous generator: plain imports, no defer_build
+    eager = directory / "eager_models"
+    shutil.copytree(directory / "lazy_models", eager)
+    for path in eager.glob("*.py"):
+        content = path.read_text()
+        path.write_text(
+            content.replace("    model_config = ConfigDict(defer_build=True)\n\n", "")
+        )
+
+    manifest = json.loads((directory / ".codegen_manifest.json").read_text())
+    (eager / "__init__.py").write_text(
+        "\n".join(
+            f"from .{entry['file'].removesuffix('.py')} import {entry['name']}"
+            for entry in manifest["sections"]["models"].values()
+            if entry["file"]
+        )
+        + "\n"
+    )
+
+
+def measure(directory: Path, package: str, statement: str, repeat: int) -> float:
+    code = (
+        "import sys, time\n"
+        f"sys.path[:0] = [{str(ROOT)!r}, {str(directory)!r}]\n"
+        "started = time.perf_counter()\n"
+        f"{statement.format(package=package)}\n"
+        "print(time.perf_counter() - started)\n"
+    )
+    return statistics.median(
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, text=True, check=True
+            ).stdout
+        )
+        for _ in range(repeat)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark models package imports")
+    parser.add_argument("--schemas", type=int, default=1500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        build_packages(directory, args.schemas)
+        results = {
+            scenario: {
+                package: measure(directory, package, statement, args.repeat)
+                for package in ("eager_models", "lazy_models")
+            }
+            for scenario, statement in SCENARIOS.items()
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for scenario, result in results.items():
+        print(
+            f"{scenario:<24} eager {result['eager_models'] * 1000:9.1f} ms "
+            f"lazy {result['lazy_models'] * 1000:9.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
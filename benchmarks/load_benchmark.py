@@ -0,0 +1,203 @@
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from benchmarks.decoding_benchmark import generate_models
+from src.api import AsyncHTTPXClient, RateLimiter
+from src.api.scheduler import cooldown_expiration
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SPECS = (
+    ROOT / ".cache" / "openapi" / "openapi.json",
+    ROOT / "benchmarks" / "fixtures" / "openapi.json",
+)
+UNLIMITED = {"action": (1e9, 1e9), "data": (1e9, 1e9), "token": (1e9, 1e9)}
+
+# Each character walks back and forth between these stops
+ROUTE = ((0, 0), (1, 0), (1, 1), (0, 1))
+
+
+class LoadStats:
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.cooldown_lag: list[float] = []
+        self.errors = 0
+
+
+def load_character(directory: Path) -> tuple[type, type]:
+    # src.api.character imports src.api.models, so the models generated from
+    # the bundled spec stand in for it
+    models = generate_models(directory)
+    sys.modules["src.api.models"] = models
+    character = importlib.import_module("src.api.character")
+    return character.Character, models.DestinationSchema
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(spec: Path, port: int, args: argparse.Namespace) -> subprocess.Popen:
+    # The server runs in its own process so CPU time measured here is the client's
+    command = [
+        sys.executable,
+        "-m",
+        "src.mock",
+        str(spec),
+        "--port",
+        str(port),
+        "--cooldown",
+        str(args.cooldown),
+        "--latency",
+        *(str(seconds) for seconds in args.latency),
+        "--seed",
+        "0",
+    ]
+    if not args.live_limits:
+        command.append("--no-rate-limits")
+    server = subprocess.Popen(command, cwd=ROOT, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return server
+        except OSError:
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError("Mock server did not start")
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+async def character_loop(
+    character: Any, destination: type, deadline: float, stats: LoadStats
+) -> None:
+    expiration = None
+    stop = 0
+    while time.monotonic() < deadline:
+        if expiration is not None:
+            remaining = (expiration - datetime.now(timezone.utc)).total_seconds()
+            await asyncio.sleep(max(remaining, 0.0))
+            lag = (datetime.now(timezone.utc) - expiration).total_seconds()
+            stats.cooldown_lag.append(max(lag, 0.0))
+
+        stop = (stop + 1) % len(ROUTE)
+        x, y = ROUTE[stop]
+        started = time.perf_counter()
+        try:
+            response = await character.move(destination(x=x, y=y))
+        except Exception:
+            stats.errors += 1
+            expiration = None
+            await asyncio.sleep(0.1)
+            continue
+        stats.latencies.append(time.perf_counter() - started)
+        expiration = cooldown_expiration(response)
+
+
+async def run(
+    url: str, args: argparse.Namespace, character_class: type, destination: type
+) -> dict[str, Any]:
+    http_client = AsyncHTTPXClient(
+        url, rate_limiter=RateLimiter(None if args.live_limits else UNLIMITED)
+    )
+    characters = [
+        character_class(http_client, f"bench{i}") for i in range(args.characters)
+    ]
+    stats = LoadStats()
+
+    cpu_started, started = time.process_time(), time.perf_counter()
+    deadline = time.monotonic() + args.duration
+    await asyncio.gather(
+        *(
+            character_loop(character, destination, deadline, stats)
+            for character in characters
+        )
+    )
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    await http_client.close()
+
+    actions = len(stats.latencies)
+    return {
+        "characters": args.characters,
+        "duration": elapsed,
+        "actions": actions,
+        "errors": stats.errors,
+        "actions_per_second": actions / elapsed,
+        "latency_p50": percentile(stats.latencies, 50),
+        "latency_p95": percentile(stats.latencies, 95),
+        "latency_p99": percentile(stats.latencies, 99),
+        "cooldown_lag_mean": (
+            statistics.fmean(stats.cooldown_lag) if stats.cooldown_lag else 0.0
+        ),
+        "cooldown_lag_p95": percentile(stats.cooldown_lag, 95),
+        "cpu_per_request": cpu / max(actions + stats.errors, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Drive simulated characters against the mock server"
+    )
+    parser.add_argument("--characters", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--cooldown", type=float, default=0.5)
+    parser.add_argument("--latency", type=float, nargs=2, default=(0.0, 0.0))
+    parser.add_argument(
+        "--live-limits",
+        action="store_true",
+        help="Keep the live API rate limits on both client and server",
+    )
+    parser.add_argument("--spec", type=Path, help="openapi.json to serve")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    spec = args.spec or next(path for path in DEFAULT_SPECS if path.exists())
+    port = free_port()
+    server = start_server(spec, port, args)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            character_class, destination = load_character(Path(directory))
+            results = asyncio.run(
+                run(f"http://127.0.0.1:{port}/", args, character_class, destination)
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(
+        f"{results['characters']} characters, {results['actions']} actions "
+        f"in {results['duration']:.1f} s ({results['errors']} errors)"
+    )
+    print(f"    throughput        {results['actions_per_second']:10.1f} actions/s")
+    for q in (50, 95, 99):
+        print(f"    latency p{q:<2}       {results[f'latency_p{q}'] * 1000:10.2f} ms")
+    print(f"    cooldown lag mean {results['cooldown_lag_mean'] * 1000:10.2f} ms")
+    print(f"    cooldown lag p95  {results['cooldown_lag_p95'] * 1000:10.2f} ms")
+    print(f"    cpu per request   {results['cpu_per_request'] * 1e6:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
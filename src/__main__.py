@@ -1,24 +1,26 @@
 import asyncio
 
 from src.api import AsyncHTTPXClient
-from src.api.generators import OpenAPIGenerator, LocalFileWriter
+from src.api.client_registry import auth_headers
+from src.api.generators import OpenAPIGenerator, LocalFileWriter, SpecCache
 from src.config import settings
 
-ARTIFACTS_URL = "https://api.artifactsmmo.com/"
-
 
 async def main():
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "Authorization": f"Bearer {settings.artifacts_token}",
-    }
-
-    http_client = AsyncHTTPXClient(ARTIFACTS_URL, headers)
+    http_client = AsyncHTTPXClient(
+        settings.artifacts_url, auth_headers(settings.artifacts_token)
+    )
 
     generator = await OpenAPIGenerator.create_generator(
         http_client=http_client,
         file_writer=LocalFileWriter(),
+        incremental=True,
+        spec_cache=SpecCache(
+            settings.openapi_cache_dir,
+            settings.openapi_offline,
+            settings.openapi_snapshot,
+        ),
+        prewarm_models=settings.prewarm_models,
     )
 
     await generator.generate_models()
@@ -1,3 +1,31 @@
+from .action_queue import ActionRunner, FileActionStore, RedisActionStore
+from .bulk import BulkResult, BulkRun
+from .cache import ResponseCache
 from .client import AsyncHTTPXClient
+from .client_registry import ClientRegistry
+from .pagination import DataPage, Paginator, fetch_all
+from .rate_limiter import RateLimiter, TokenBucket
+from .retry import CircuitBreakers, CircuitOpenError, RetryPolicy
+from .scheduler import CooldownScheduler
+from .singleflight import SingleFlight
 
-__all__ = ["AsyncHTTPXClient"]
+__all__ = [
+    "ActionRunner",
+    "AsyncHTTPXClient",
+    "BulkResult",
+    "BulkRun",
+    "CircuitBreakers",
+    "CircuitOpenError",
+    "ClientRegistry",
+    "CooldownScheduler",
+    "DataPage",
+    "FileActionStore",
+    "Paginator",
+    "RateLimiter",
+    "RedisActionStore",
+    "ResponseCache",
+    "RetryPolicy",
+    "SingleFlight",
+    "TokenBucket",
+    "fetch_all",
+]
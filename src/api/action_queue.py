@@ -0,0 +1,482 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import cache
+from pathlib import Path
+from typing import Any, Protocol, get_type_hints
+
+import httpx
+from redis.asyncio import Redis
+
+from src.api.decoding import type_adapter
+from src.api.scheduler import CooldownScheduler
+
+# ArtifactsMMO codes proving a replayed action had already taken effect,
+# other actions are reconciled against the character's cooldown instead
+ALREADY_APPLIED = {"move": {490}}  # Character already at destination
+# How far apart this host's and the API's clocks may be
+CLOCK_SKEW = 1.0
+
+Actions = dict[str, list[tuple[str, dict[str, Any]]]]
+
+
+@dataclass
+class ActionRecord:
+    seq: int
+    action: str
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class InFlight:
+    seq: int
+    started_at: float | None  # Unix time the request was sent
+    # The scheduler knew the previous cooldown was over when it sent, so a
+    # later cooldown can't be the previous action's
+    cooled_down: bool = False
+
+
+class ReplayNeedsReview(Exception):
+    pass
+
+
+class ActionStoreProtocol(Protocol):
+    async def append(self, actions: Actions) -> None:
+        pass
+
+    async def pending(
+        self, character_name: str, limit: int = 100
+    ) -> list[ActionRecord]:
+        pass
+
+    async def start(
+        self, character_name: str, seq: int, started_at: float, cooled_down: bool
+    ) -> None:
+        pass
+
+    async def complete(self, character_name: str, seq: int) -> None:
+        pass
+
+    async def in_flight(self, character_name: str) -> InFlight | None:
+        pass
+
+    async def characters(self) -> list[str]:
+        pass
+
+
+class RedisActionStore:
+    # Seq numbers are assigned and pushed in one step so concurrent producers
+    # can't interleave out of order
+    APPEND_SCRIPT = """
+    local last = redis.call('INCRBY', KEYS[1], #ARGV)
+    local first = last - #ARGV
+    for i, payload in ipairs(ARGV) do
+        redis.call('RPUSH', KEYS[2], (first + i) .. '|' .. payload)
+    end
+    return last
+    """
+
+    def __init__(self, redis: Redis, prefix: str = "artifacts:actions:") -> None:
+        self.redis = redis
+        self.prefix = prefix
+        self._append = redis.register_script(self.APPEND_SCRIPT)
+
+    async def append(self, actions: Actions) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for character_name, items in actions.items():
+                await self._append(
+                    keys=[
+                        self._key(character_name, "seq"),
+                        self._key(character_name, "log"),
+                    ],
+                    args=[
+                        json.dumps([action, params], separators=(",", ":"))
+                        for action, params in items
+                    ],
+                    client=pipe,
+                )
+            pipe.sadd(f"{self.prefix}characters", *actions)
+            await pipe.execute()
+
+    async def pending(
+        self, character_name: str, limit: int = 100
+    ) -> list[ActionRecord]:
+        entries = await self.redis.lrange(
+            self._key(character_name, "log"), 0, limit - 1
+        )
+        records = []
+        for entry in entries:
+            seq, payload = as_text(entry).split("|", 1)
+            action, params = json.loads(payload)
+            records.append(ActionRecord(int(seq), action, params))
+        return records
+
+    async def start(
+        self, character_name: str, seq: int, started_at: float, cooled_down: bool
+    ) -> None:
+        await self.redis.set(
+            self._key(character_name, "started"),
+            f"{seq}|{started_at}|{int(cooled_down)}",
+        )
+
+    async def complete(self, character_name: str, seq: int) -> None:
+        # The head of the log is always the record being completed
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.lpop(self._key(character_name, "log"))
+            pipe.set(self._key(character_name, "cursor"), seq)
+            pipe.delete(self._key(character_name, "started"))
+            await pipe.execute()
+
+    async def in_flight(self, character_name: str) -> InFlight | None:
+        started = await self.redis.get(self._key(character_name, "started"))
+        if started is None:
+            return None
+        seq, started_at, cooled_down = (as_text(started).split("|") + ["", ""])[:3]
+        return InFlight(
+            int(seq), float(started_at) if started_at else None, cooled_down == "1"
+        )
+
+    async def characters(self) -> list[str]:
+        members = await self.redis.smembers(f"{self.prefix}characters")
+        return sorted(as_text(member) for member in members)
+
+    def _key(self, character_name: str, part: str) -> str:
+        return f"{self.prefix}{character_name}:{part}"
+
+
+def as_text(value: bytes | str) -> str:
+    # Replies are bytes unless the client was made with decode_responses=True
+    return value.decode() if isinstance(value, bytes) else value
+
+
+@dataclass
+class ActionLog:
+    records: deque[ActionRecord] = field(default_factory=deque)
+    seq: int = 0
+    cursor: int = 0
+    started: InFlight | None = None
+    entries: int = 0
+
+
+class FileActionStore:
+    def __init__(
+        self, directory: str = "./.cache/actions", compact_after: int = 1000
+    ) -> None:
+        self.directory = Path(directory)
+        self.compact_after = compact_after
+        self.logs: dict[str, ActionLog] = dict()
+        self.locks: dict[str, asyncio.Lock] = dict()
+
+    async def append(self, actions: Actions) -> None:
+        for character_name, items in actions.items():
+            async with self._lock(character_name):
+                log = await self._log(character_name)
+                lines = []
+                for action, params in items:
+                    log.seq += 1
+                    log.records.append(ActionRecord(log.seq, action, params))
+                    lines.append({"seq": log.seq, "action": action, "params": params})
+                await self._write(character_name, lines)
+
+    async def pending(
+        self, character_name: str, limit: int = 100
+    ) -> list[ActionRecord]:
+        async with self._lock(character_name):
+            log = await self._log(character_name)
+        return list(itertools.islice(log.records, limit))
+
+    async def start(
+        self, character_name: str, seq: int, started_at: float, cooled_down: bool
+    ) -> None:
+        async with self._lock(character_name):
+            started = InFlight(seq, started_at, cooled_down)
+            (await self._log(character_name)).started = started
+            await self._write(character_name, [start_entry(started)])
+
+    async def complete(self, character_name: str, seq: int) -> None:
+        async with self._lock(character_name):
+            log = await self._log(character_name)
+            log.records.popleft()
+            log.cursor, log.started = seq, None
+            await self._write(character_name, [{"done": seq}])
+            if log.entries >= self.compact_after:
+                await self._compact(character_name)
+
+    async def in_flight(self, character_name: str) -> InFlight | None:
+        async with self._lock(character_name):
+            return (await self._log(character_name)).started
+
+    async def characters(self) -> list[str]:
+        return sorted(path.stem for path in self.directory.glob("*.log"))
+
+    def _lock(self, character_name: str) -> asyncio.Lock:
+        return self.locks.setdefault(character_name, asyncio.Lock())
+
+    async def _log(self, character_name: str) -> ActionLog:
+        # File IO runs in a thread, callers hold the character's lock
+        if character_name not in self.logs:
+            self.logs[character_name] = await asyncio.to_thread(
+                self._replay, self._path(character_name)
+            )
+        return self.logs[character_name]
+
+    async def _write(self, character_name: str, entries: list[dict[str, Any]]) -> None:
+        await asyncio.to_thread(write_lines, self._path(character_name), entries, "a")
+        self.logs[character_name].entries += len(entries)
+
+    async def _compact(self, character_name: str) -> None:
+        log = self.logs[character_name]
+        # The header keeps seq numbers monotonic once completed records are gone
+        entries: list[dict[str, Any]] = [{"cursor": log.cursor, "last": log.seq}]
+        entries += [
+            {"seq": record.seq, "action": record.action, "params": record.params}
+            for record in log.records
+        ]
+        if log.started is not None:
+            entries.append(start_entry(log.started))
+
+        path = self._path(character_name)
+        temporary = path.with_suffix(".tmp")
+        await asyncio.to_thread(write_lines, temporary, entries, "w")
+        await asyncio.to_thread(temporary.replace, path)
+        log.entries = len(entries)
+
+    @staticmethod
+    def _replay(path: Path) -> ActionLog:
+        log = ActionLog()
+        if not path.exists():
+            return log
+        # Replay the append-only file to rebuild the queue and cursor
+        with open(path, "rb+") as f:
+            complete = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A torn final write is cut off, or the next append would
+                    # be glued onto it
+                    f.truncate(complete)
+                    break
+                complete += len(line)
+                entry = json.loads(line)
+                log.entries += 1
+                if "seq" in entry:
+                    log.seq = max(log.seq, entry["seq"])
+                    log.records.append(
+                        ActionRecord(entry["seq"], entry["action"], entry["params"])
+                    )
+                elif "start" in entry:
+                    log.started = InFlight(
+                        entry["start"], entry.get("at"), entry.get("cooled", False)
+                    )
+                elif "cursor" in entry:
+                    log.cursor, log.seq = entry["cursor"], entry["last"]
+                elif "done" in entry:
+                    log.records.popleft()
+                    log.cursor, log.started = entry["done"], None
+        return log
+
+    def _path(self, character_name: str) -> Path:
+        return self.directory / f"{character_name}.log"
+
+
+def start_entry(started: InFlight) -> dict[str, Any]:
+    return {
+        "start": started.seq,
+        "at": started.started_at,
+        "cooled": started.cooled_down,
+    }
+
+
+def write_lines(path: Path, entries: list[dict[str, Any]], mode: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, mode) as f:
+        f.writelines(
+            json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries
+        )
+        f.flush()
+        os.fsync(f.fileno())
+
+
+@cache
+def action_parameters(owner: type, action: str) -> dict[str, Any]:
+    if action.startswith("_") or not callable(getattr(owner, action, None)):
+        raise ValueError(f"Unknown action: {action}")
+    hints = get_type_hints(getattr(owner, action))
+    hints.pop("return", None)
+    return hints
+
+
+class ActionRunner:
+    def __init__(
+        self,
+        store: ActionStoreProtocol,
+        scheduler: CooldownScheduler,
+        characters: dict[str, Any],
+        batch_size: int = 50,
+    ) -> None:
+        self.store = store
+        self.scheduler = scheduler
+        self.characters = characters
+        self.batch_size = batch_size
+        self._running: dict[str, asyncio.Task] = dict()
+        self._wake: set[str] = set()
+        self.needs_review: dict[str, ActionRecord] = dict()
+        self._rerun: set[str] = set()
+        self.logger = logging.getLogger(__name__)
+
+    async def enqueue(self, actions: Actions) -> None:
+        await self.store.append(actions)
+        for character_name in actions:
+            self._ensure_running(character_name)
+
+    async def resume(self) -> None:
+        for character_name in await self.store.characters():
+            if character_name in self.characters:
+                self._ensure_running(character_name)
+
+    async def join(self) -> None:
+        while self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    async def stop(self) -> None:
+        for task in self._running.values():
+            task.cancel()
+        await self.join()
+
+    def _ensure_running(self, character_name: str) -> None:
+        # A running task sees the flag once its batch is done, so records
+        # appended while it reads the store aren't left waiting
+        self._wake.add(character_name)
+        if character_name not in self._running:
+            self._running[character_name] = asyncio.create_task(
+                self._run(character_name)
+            )
+
+    async def resolve(self, character_name: str, applied: bool) -> None:
+        # Settles a record held for review, then resumes the queue
+        record = self.needs_review.pop(character_name, None)
+        if record is None:
+            return
+        if applied:
+            await self.store.complete(character_name, record.seq)
+        else:
+            self._rerun.add(character_name)
+        self._ensure_running(character_name)
+
+    async def _run(self, character_name: str) -> None:
+        try:
+            while character_name in self._wake:
+                self._wake.discard(character_name)
+                if not await self._drain(character_name):
+                    return
+        finally:
+            # Unregistered without yielding after the last check, so a later
+            # enqueue always starts a new task
+            self._wake.discard(character_name)
+            if self._running.get(character_name) is asyncio.current_task():
+                del self._running[character_name]
+
+    async def _drain(self, character_name: str) -> bool:
+        # False if the queue halted on a record that has to wait
+        character = self.characters[character_name]
+        in_flight = await self.store.in_flight(character_name)
+        if character_name in self._rerun:
+            self._rerun.discard(character_name)
+            in_flight = None
+        while records := await self.store.pending(character_name, self.batch_size):
+            for record in records:
+                replay = (
+                    in_flight if record.seq == getattr(in_flight, "seq", None) else None
+                )
+                try:
+                    await self._execute(character, record, replay)
+                except ReplayNeedsReview as e:
+                    self.needs_review[character_name] = record
+                    self.logger.error(
+                        f"Action {record.seq} ({record.action}) of "
+                        f"{character_name} needs review, queue halted: {e}"
+                    )
+                    return False
+                except Exception as e:
+                    # The record stays at the head of the queue for a later resume
+                    self.logger.error(
+                        f"Action {record.seq} ({record.action}) of "
+                        f"{character_name} failed, queue halted: {e}"
+                    )
+                    return False
+                await self.store.complete(character_name, record.seq)
+        return True
+
+    async def _execute(
+        self, character: Any, record: ActionRecord, replay: InFlight | None
+    ) -> None:
+        character_name = character.character_name
+        if (
+            replay is not None
+            and record.action not in ALREADY_APPLIED
+            and await self._reconcile(character, replay)
+        ):
+            self.logger.info(
+                f"Action {record.seq} of {character_name} was already applied"
+            )
+            return
+
+        hints = action_parameters(type(character), record.action)
+        kwargs = {
+            name: (
+                type_adapter(hints[name]).validate_python(value)
+                if name in hints
+                else value
+            )
+            for name, value in record.params.items()
+        }
+        method = getattr(character, record.action)
+
+        async def send() -> Any:
+            # Stamped once the cooldown wait is over, right before the request
+            await self.store.start(
+                character_name,
+                record.seq,
+                time.time(),
+                self.scheduler.cooled_down(character_name),
+            )
+            return await method(**kwargs)
+
+        try:
+            await self.scheduler.submit(character_name, send)
+        except httpx.HTTPStatusError as e:
+            # The previous process may have crashed after the action was sent
+            codes = ALREADY_APPLIED.get(record.action, ())
+            if not (replay is not None and e.response.status_code in codes):
+                raise
+            self.logger.info(
+                f"Action {record.seq} of {character_name} was already applied"
+            )
+
+    async def _reconcile(self, character: Any, replay: InFlight) -> bool:
+        # True if the action applied, False if it can safely run again
+        state = getattr(character, "state", None)
+        if state is None or replay.started_at is None:
+            raise ReplayNeedsReview("no character state to reconcile against")
+        state.invalidate("replaying an in-flight action")
+        try:
+            expiration = (await state.current()).cooldown_expiration
+        except httpx.HTTPError as e:
+            raise ReplayNeedsReview(f"character state unavailable: {e}")
+        if expiration is None:
+            raise ReplayNeedsReview("character has no cooldown expiration")
+        expires = expiration.timestamp()
+        if expires < replay.started_at - CLOCK_SKEW:
+            return False  # Over before the send, so this action never set it
+        if expires > replay.started_at + CLOCK_SKEW and replay.cooled_down:
+            return True
+        # A scheduler without cooldown knowledge may have sent into the
+        # previous cooldown and crashed while retrying the 499, that cooldown
+        # then proves nothing about this action
+        raise ReplayNeedsReview(
+            "character cooldown doesn't show whether the action applied"
+        )
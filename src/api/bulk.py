@@ -0,0 +1,94 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
+
+import httpx
+
+EndpointMethod = Callable[..., Awaitable[tuple[str, Any]]]
+
+
+@dataclass
+class BulkResult:
+    index: int
+    arguments: Any
+    description: str | None = None
+    response: Any = None
+    status_code: int | None = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BulkRun:
+    # Requests still go through the client and share its rate limiter,
+    # concurrency only bounds how many are in flight at once
+
+    def __init__(
+        self,
+        method: EndpointMethod,
+        arguments: Iterable[dict[str, Any] | tuple | Any],
+        concurrency: int = 8,
+        status_codes: dict[int, str] | None = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.method = method
+        self.arguments = arguments
+        self.concurrency = concurrency
+        # Endpoint methods only return a description, generated code passes
+        # the status code -> description table to recover the code
+        self.status_codes = status_codes or dict()
+
+    def __aiter__(self) -> AsyncIterator[BulkResult]:
+        return self._iterate()
+
+    async def collect(self) -> list[BulkResult]:
+        return [result async for result in self]
+
+    async def _iterate(self) -> AsyncIterator[BulkResult]:
+        # A sliding window: the oldest request is awaited first, and a new one
+        # starts only when it is handed out, so memory stays bounded for
+        # arbitrarily long inputs
+        window: deque[asyncio.Task] = deque()
+        arguments = enumerate(self.arguments)
+        try:
+            for index, item in arguments:
+                window.append(asyncio.create_task(self._call(index, item)))
+                if len(window) >= self.concurrency:
+                    yield await window.popleft()
+            while window:
+                yield await window.popleft()
+        finally:
+            for task in window:
+                task.cancel()
+            await asyncio.gather(*window, return_exceptions=True)
+
+    def _status_code(self, description: str | None) -> int | None:
+        # Errors raise, so a returned description belongs to a 2xx code, even
+        # if an error code shares its text
+        codes = [
+            status_code
+            for status_code, text in self.status_codes.items()
+            if text == description
+        ]
+        return min(codes, key=lambda code: not 200 <= code < 300, default=None)
+
+    async def _call(self, index: int, arguments: Any) -> BulkResult:
+        result = BulkResult(index, arguments)
+        try:
+            if isinstance(arguments, dict):
+                result.description, result.response = await self.method(**arguments)
+            elif isinstance(arguments, tuple):
+                result.description, result.response = await self.method(*arguments)
+            else:
+                result.description, result.response = await self.method(arguments)
+            result.status_code = self._status_code(result.description)
+        except httpx.HTTPStatusError as e:
+            result.status_code = e.response.status_code
+            result.error = e
+        except (httpx.TransportError, ValueError) as e:
+            result.error = e
+        return result
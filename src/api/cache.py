@@ -0,0 +1,162 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Protocol
+from urllib.parse import urlsplit
+
+import httpx
+from redis.asyncio import Redis
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    content: bytes
+    etag: str | None
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class CacheTierProtocol(Protocol):
+    async def get(self, key: str) -> CachedResponse | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: CachedResponse) -> None:
+        pass
+
+
+class MemoryCacheTier:
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    async def get(self, key: str) -> CachedResponse | None:
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: CachedResponse) -> None:
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+class RedisCacheTier:
+    def __init__(
+        self, redis: Redis, prefix: str = "artifacts:cache:", stale_ttl: int = 86400
+    ) -> None:
+        self.redis = redis
+        self.prefix = prefix
+        # Expired entries are kept this long so they can still be revalidated
+        self.stale_ttl = stale_ttl
+
+    async def get(self, key: str) -> CachedResponse | None:
+        value = await self.redis.hgetall(self.prefix + key)
+        if not value:
+            return None
+        return CachedResponse(
+            status_code=int(value[b"status_code"]),
+            content=value[b"content"],
+            etag=value[b"etag"].decode() or None,
+            expires_at=float(value[b"expires_at"]),
+        )
+
+    async def set(self, key: str, value: CachedResponse) -> None:
+        ttl = max(int(value.expires_at - time.time()), 0) + self.stale_ttl
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(
+                self.prefix + key,
+                mapping={
+                    "status_code": value.status_code,
+                    "content": value.content,
+                    "etag": value.etag or "",
+                    "expires_at": value.expires_at,
+                },
+            )
+            pipe.expire(self.prefix + key, ttl)
+            await pipe.execute()
+
+
+class ResponseCache:
+    # Seconds to keep static game data, keyed by the first path segment
+    DEFAULT_TTLS = {
+        "items": 3600.0,
+        "monsters": 3600.0,
+        "resources": 3600.0,
+        "maps": 600.0,
+        "npcs": 3600.0,
+    }
+
+    def __init__(
+        self,
+        ttls: dict[str, float] | None = None,
+        maxsize: int = 1024,
+        redis: Redis | None = None,
+    ) -> None:
+        self.ttls = self.DEFAULT_TTLS if ttls is None else ttls
+        self.tiers: list[CacheTierProtocol] = [MemoryCacheTier(maxsize)]
+        if redis is not None:
+            self.tiers.append(RedisCacheTier(redis))
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def ttl_for(self, url: str) -> float | None:
+        segment = urlsplit(url).path.strip("/").split("/")[0]
+        return self.ttls.get(segment)
+
+    async def fetch(
+        self,
+        key: str,
+        ttl: float,
+        send: Callable[[dict[str, str] | None], Awaitable[httpx.Response]],
+    ) -> CachedResponse:
+        cached = await self._get(key)
+        if cached is not None and cached.fresh:
+            self.hits += 1
+            return cached
+
+        headers = {"If-None-Match": cached.etag} if cached and cached.etag else None
+        response = await send(headers)
+        if cached is not None and response.status_code == httpx.codes.NOT_MODIFIED:
+            self.revalidations += 1
+            cached.expires_at = time.time() + ttl
+            await self._set(key, cached)
+            return cached
+
+        self.misses += 1
+        cached = CachedResponse(
+            status_code=response.status_code,
+            content=response.content,
+            etag=response.headers.get("ETag"),
+            expires_at=time.time() + ttl,
+        )
+        if response.status_code == httpx.codes.OK:
+            await self._set(key, cached)
+        return cached
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+        }
+
+    async def _get(self, key: str) -> CachedResponse | None:
+        for index, tier in enumerate(self.tiers):
+            cached = await tier.get(key)
+            if cached is not None:
+                for upper_tier in self.tiers[:index]:  # Promote to faster tiers
+                    await upper_tier.set(key, cached)
+                return cached
+        return None
+
+    async def _set(self, key: str, value: CachedResponse) -> None:
+        for tier in self.tiers:
+            await tier.set(key, value)
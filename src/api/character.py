@@ -1,16 +1,71 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from src.api.character_state import DIVERGENCE_CODES, CharacterState
 from src.api.client import HTTPClientProtocol
 from src.api.models import DestinationSchema, CharacterMovementResponseSchema
+from src.api.scheduler import cooldown_expiration
+from src.game.routing import Position, Route, RoutePlanner
 
 
 class Character:
-    def __init__(self, http_client: HTTPClientProtocol, character_name: str) -> None:
+    def __init__(
+        self,
+        http_client: HTTPClientProtocol,
+        character_name: str,
+        route_planner: RoutePlanner | None = None,
+        state: CharacterState | None = None,
+    ) -> None:
         self.character_name = character_name
         self.http_client = http_client
-        self.http_client.url += f"my/{self.character_name}/action/"
+        self.base_path = f"my/{self.character_name}/action/"
+        self.route_planner = route_planner or RoutePlanner()
+        self.state = state or CharacterState(http_client, character_name)
 
     async def move(
         self, destination_schema: DestinationSchema
     ) -> CharacterMovementResponseSchema:
-        await self.http_client.post(
+        return await self._action(
             "move", destination_schema.model_dump(), CharacterMovementResponseSchema
         )
+
+    async def run_errand(
+        self,
+        start: Position | None,
+        stops: list[Position],
+        on_arrival: Callable[[Position], Awaitable[Any]] | None = None,
+    ) -> Route:
+        if start is None:
+            start = (await self.state.current()).position
+        route = self.route_planner.plan(start, stops)
+        position = start
+        for stop in route.stops:
+            if stop != position:
+                response = await self.move(DestinationSchema(x=stop[0], y=stop[1]))
+                await self._wait_cooldown(response)
+                position = stop
+            if on_arrival is not None:
+                await self._wait_cooldown(await on_arrival(stop))
+        return route
+
+    async def _action(self, action: str, data: dict, response_model: Any) -> Any:
+        try:
+            _, response = await self.http_client.post(
+                self.base_path + action, data, response_model
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in DIVERGENCE_CODES:
+                self.state.invalidate(e.response.status_code)
+            raise
+        self.state.apply(response)
+        return response
+
+    @staticmethod
+    async def _wait_cooldown(response: Any) -> None:
+        expiration = cooldown_expiration(response)
+        if expiration is not None:
+            remaining = (expiration - datetime.now(timezone.utc)).total_seconds()
+            await asyncio.sleep(max(remaining, 0.0))
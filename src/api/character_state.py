@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
+from typing import Any
+
+from src.api.client import HTTPClientProtocol
+from src.api.models import CharacterResponseSchema
+from src.api.scheduler import parse_datetime
+from src.game.map_index import Position
+
+SKILLS = (
+    "mining",
+    "woodcutting",
+    "fishing",
+    "weaponcrafting",
+    "gearcrafting",
+    "jewelrycrafting",
+    "cooking",
+    "alchemy",
+)
+
+# ArtifactsMMO errors that mean the server disagrees with our copy of the character
+DIVERGENCE_CODES = {
+    478,  # Missing item or insufficient quantity
+    486,  # An action is already in progress
+    490,  # Already at destination
+    493,  # Skill level too low
+    497,  # Inventory full
+    499,  # Character in cooldown
+}
+
+
+@dataclass(frozen=True)
+class CharacterSnapshot:
+    version: int
+    character: Any
+    bank: tuple[Any, ...] | None
+    updated_at: float
+
+    @property
+    def position(self) -> Position:
+        return self.character.x, self.character.y
+
+    @cached_property
+    def inventory(self) -> dict[str, int]:
+        inventory = dict()
+        for slot in self.character.inventory:
+            if slot.code:
+                inventory[slot.code] = inventory.get(slot.code, 0) + slot.quantity
+        return inventory
+
+    @cached_property
+    def bank_items(self) -> dict[str, int] | None:
+        if self.bank is None:
+            return None
+        return {item.code: item.quantity for item in self.bank}
+
+    @cached_property
+    def skills(self) -> dict[str, int]:
+        return {skill: getattr(self.character, f"{skill}_level") for skill in SKILLS}
+
+    @cached_property
+    def cooldown_expiration(self) -> datetime | None:
+        return parse_datetime(self.character.cooldown_expiration)
+
+
+class CharacterState:
+    def __init__(self, http_client: HTTPClientProtocol, character_name: str) -> None:
+        self.http_client = http_client
+        self.character_name = character_name
+        self.snapshot: CharacterSnapshot | None = None
+        self.stale = True
+        self.refreshes = 0
+        self._changed = asyncio.Event()
+        self._refresh_lock = asyncio.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def version(self) -> int:
+        return self.snapshot.version if self.snapshot is not None else 0
+
+    def read(self) -> CharacterSnapshot | None:
+        return self.snapshot
+
+    async def current(self) -> CharacterSnapshot:
+        if self.stale or self.snapshot is None:
+            await self.refresh()
+        return self.snapshot
+
+    async def wait_for_change(
+        self, version: int, timeout: float | None = None
+    ) -> CharacterSnapshot:
+        async with asyncio.timeout(timeout):
+            while self.version <= version:
+                await self._changed.wait()
+        return self.snapshot
+
+    def apply(self, response: Any) -> bool:
+        if isinstance(response, tuple):  # (status, model) from clients and endpoints
+            response = response[-1]
+        data = getattr(response, "data", None)
+        character = getattr(data, "character", None)
+        if character is None:
+            # Fights with several characters report all of them
+            character = next(
+                (
+                    character
+                    for character in getattr(data, "characters", None) or ()
+                    if character.name == self.character_name
+                ),
+                None,
+            )
+        if character is None:
+            return False
+
+        bank = getattr(data, "bank", None)
+        self._publish(
+            character,
+            tuple(bank) if bank is not None else getattr(self.snapshot, "bank", None),
+        )
+        return True
+
+    def invalidate(self, reason: Any = None) -> None:
+        self.logger.info(f"State of {self.character_name} diverged: {reason}")
+        self.stale = True
+
+    async def refresh(self) -> CharacterSnapshot:
+        async with self._refresh_lock:
+            if not self.stale and self.snapshot is not None:
+                return self.snapshot  # Refreshed while we waited for the lock
+            _, response = await self.http_client.get(
+                f"characters/{self.character_name}", CharacterResponseSchema
+            )
+            self.refreshes += 1
+            self._publish(response.data, getattr(self.snapshot, "bank", None))
+            return self.snapshot
+
+    def _publish(self, character: Any, bank: tuple[Any, ...] | None) -> None:
+        self.snapshot = CharacterSnapshot(
+            self.version + 1, character, bank, time.monotonic()
+        )
+        self.stale = False
+        # Wake current readers and hand later ones a fresh event
+        self._changed.set()
+        self._changed = asyncio.Event()
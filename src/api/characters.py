@@ -8,13 +8,13 @@ from src.api.models import (
 class Characters:
     def __init__(self, http_client: HTTPClientProtocol) -> None:
         self.http_client = http_client
-        self.http_client.url += f"characters/"
+        self.base_path = "characters/"
 
     async def create(
         self, add_character_schema: AddCharacterSchema
     ) -> CharacterResponseSchema:
         return await self.http_client.post(
-            "create",
+            self.base_path + "create",
             add_character_schema.model_dump(mode="json"),
             CharacterResponseSchema,
         )
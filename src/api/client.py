@@ -1,10 +1,25 @@
+import asyncio
+import hashlib
 import logging
+import time
+from urllib.parse import urlsplit
 
 import httpx
 from typing import Protocol, Any, TypeVar, Type
 
 from pydantic import BaseModel
 
+from src.api.cache import ResponseCache
+from src.api.decoding import decode
+from src.api.rate_limiter import RateLimiter, parse_retry_after
+from src.api.retry import (
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+    RetryPolicy,
+)
+from src.api.singleflight import SingleFlight
+
 T = TypeVar("T", bound=BaseModel)
 
 
@@ -24,25 +39,121 @@ class HTTPClientProtocol(Protocol):
     ) -> tuple[int, T]:
         raise NotImplementedError
 
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        data: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        raise NotImplementedError
+
     async def close(self) -> None:
         pass
 
 
+class ClientHookProtocol(Protocol):
+    def on_response(
+        self,
+        method: str,
+        url: str,
+        status_code: int,
+        elapsed: float,
+        size: int,
+        requeues: int,
+    ) -> None:
+        pass
+
+    def on_decode(self, response_model: Any, elapsed: float) -> None:
+        pass
+
+    def on_retry(self, method: str, url: str) -> None:
+        pass
+
+    def on_breaker(self, host: str, state: str) -> None:
+        pass
+
+
 class AsyncHTTPXClient:
-    def __init__(self, url: str, headers: dict[str, str] | None = None) -> None:
-        self.client = httpx.AsyncClient(headers=headers)
+    # Shared by every API wrapper, so a few keep-alive connections serve all characters
+    DEFAULT_LIMITS = httpx.Limits(
+        max_connections=20, max_keepalive_connections=20, keepalive_expiry=60.0
+    )
+
+    def __init__(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        rate_limiter: RateLimiter | None = None,
+        max_requeues: int = 5,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        cache: ResponseCache | None = None,
+        hooks: list[ClientHookProtocol] | None = None,
+        singleflight: SingleFlight | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        retry: RetryPolicy | None = None,
+        breakers: CircuitBreakers | None = None,
+    ) -> None:
+        if transport is None:
+            self.client = httpx.AsyncClient(
+                headers=headers, limits=limits or self.DEFAULT_LIMITS, http2=http2
+            )
+        else:
+            # A shared connection pool, limits and http2 are the transport's
+            self.client = httpx.AsyncClient(headers=headers, transport=transport)
+        self.owns_transport = transport is None
         self.url = url
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_requeues = max_requeues
+        self.cache = cache
+        self.hooks = hooks or list()
+        self.singleflight = singleflight
+        # Keys shared flights by token without keeping another copy of it
+        self.identity = hashlib.sha256(
+            self.client.headers.get("Authorization", "").encode()
+        ).hexdigest()
+        # Pass RetryPolicy(max_attempts=1) to fail on the first error
+        self.retry = retry or RetryPolicy()
+        self.breakers = breakers or CircuitBreakers()
         self.logger = logging.getLogger(__name__)
 
+    @property
+    def breaker_states(self) -> dict[str, str]:
+        return {host: breaker.state for host, breaker in self.breakers.breakers.items()}
+
+    @property
+    def queue_depth(self) -> dict[str, int]:
+        return self.rate_limiter.queue_depth()
+
     async def get(
         self, endpoint: str, response_model: Type[T] | None = None
     ) -> tuple[int, T]:
-        response = await self.client.get(self.url + endpoint)
-        response.raise_for_status()
-        if response_model:
-            return response.status_code, response_model.model_validate(response.json())
+        if self.singleflight is None:
+            status_code, content = await self._fetch(endpoint)
+        else:
+            # Concurrent identical reads share one request; each caller still
+            # decodes its own copy, so models are never shared between callers
+            status_code, content = await self.singleflight.do(
+                "GET",
+                self.url + endpoint,
+                lambda: self._fetch(endpoint),
+                self.identity,
+            )
+        return self._decode(status_code, content, response_model)
+
+    async def _fetch(self, endpoint: str) -> tuple[int, bytes]:
+        ttl = self.cache.ttl_for(self.url + endpoint) if self.cache else None
+        if ttl is None:
+            response = await self.request("GET", endpoint)
+            return response.status_code, response.content
 
-        return response.status_code, response.json()
+        cached = await self.cache.fetch(
+            self.url + endpoint,
+            ttl,
+            lambda headers: self.request("GET", endpoint, headers=headers),
+        )
+        return cached.status_code, cached.content
 
     async def post(
         self,
@@ -50,12 +161,132 @@ class AsyncHTTPXClient:
         data: dict[str, Any] | None = None,
         response_model: Type[T] | None = None,
     ) -> tuple[int, T]:
-        response = await self.client.post(self.url + endpoint, json=data)
-        response.raise_for_status()
-        if response_model:
-            return response.status_code, response_model.model_validate(response.json())
+        response = await self.request("POST", endpoint, data)
+        return self._decode(response.status_code, response.content, response_model)
+
+    def _decode(
+        self, status_code: int, content: bytes, response_model: Type[T] | None
+    ) -> tuple[int, T]:
+        if not self.hooks:
+            return status_code, decode(content, response_model)
+
+        started = time.perf_counter()
+        result = decode(content, response_model)
+        elapsed = time.perf_counter() - started
+        for hook in self.hooks:
+            hook.on_decode(response_model, elapsed)
+        return status_code, result
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        data: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        url = self.url + endpoint
+        breaker = self.breakers.for_url(url)
+        attempt = 0
+        while True:
+            state = breaker.state
+            allowed = breaker.allow()
+            self._track(url, breaker, state)
+            if not allowed:
+                raise CircuitOpenError(f"Circuit open for {method} {url}")
 
-        return response.status_code, response.json()
+            state = breaker.state
+            try:
+                response = await self._send(method, url, data, headers)
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                self._track(url, breaker, state)
+                if not self.retry.retry_error(method, attempt, e):
+                    raise
+                delay = self.retry.delay(attempt)
+                self.logger.warning(
+                    f"{type(e).__name__} on {method} {url}, retrying in {delay:.2f}s"
+                )
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                self._track(url, breaker, state)
+                if not self.retry.retry_status(method, attempt, response.status_code):
+                    break
+                delay = self.retry.delay(attempt, response)
+                self.logger.warning(
+                    f"{response.status_code} on {method} {url}, "
+                    f"retrying in {delay:.2f}s"
+                )
+
+            for hook in self.hooks:
+                hook.on_retry(method, url)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        if response.status_code != httpx.codes.NOT_MODIFIED:  # Conditional GETs
+            response.raise_for_status()
+        return response
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        data: dict[str, Any] | None,
+        headers: dict[str, str] | None,
+    ) -> httpx.Response:
+        bucket = self.rate_limiter.bucket_for(method, url)
+        started = time.perf_counter()
+        for requeues in range(self.max_requeues + 1):
+            await bucket.acquire()
+            try:
+                response = await self.client.request(
+                    method, url, json=data, headers=headers
+                )
+            except httpx.TransportError:
+                self._report(method, url, 0, started, 0, requeues)
+                raise
+            if response.status_code != 429:
+                break
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.logger.warning(
+                f"Rate limited on {method} {url}, requeueing in {retry_after}s"
+            )
+            bucket.pause(retry_after)
+
+        self._report(
+            method, url, response.status_code, started, len(response.content), requeues
+        )
+        return response
+
+    def _track(self, url: str, breaker: CircuitBreaker, previous: str) -> None:
+        if breaker.state == previous:
+            return
+        host = urlsplit(url).netloc
+        self.logger.warning(f"Circuit for {host} is now {breaker.state}")
+        for hook in self.hooks:
+            hook.on_breaker(host, breaker.state)
+
+    def _report(
+        self,
+        method: str,
+        url: str,
+        status_code: int,
+        started: float,
+        size: int,
+        requeues: int,
+    ) -> None:
+        elapsed = time.perf_counter() - started
+        for hook in self.hooks:
+            hook.on_response(method, url, status_code, elapsed, size, requeues)
 
     async def close(self) -> None:
-        await self.client.aclose()
+        # Closing the httpx client closes its transport, which other clients
+        # may still be using
+        if self.owns_transport:
+            await self.client.aclose()
@@ -0,0 +1,195 @@
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+import httpx
+
+from src.api.client import AsyncHTTPXClient
+from src.api.rate_limiter import RateLimiter
+from src.api.retry import CircuitBreakers
+
+
+def auth_headers(token: str) -> dict[str, str]:
+    return {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "Authorization": f"Bearer {token}",
+    }
+
+
+class CountingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, done: Any) -> None:
+        self.stream = stream
+        self.done = done
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            self.done()
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    # Counts requests through the public transport API instead of reading
+    # the pool's internals; a request holds a connection until its body is closed
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self.transport = transport
+        self.active = 0
+        self.peak = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            self.active -= 1
+            raise
+        response.stream = CountingStream(response.stream, self._release)
+        return response
+
+    def _release(self) -> None:
+        self.active -= 1
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+@dataclass
+class ClientEntry:
+    client: AsyncHTTPXClient
+    last_used: float
+    leases: int = 0
+
+
+class ClientRegistry:
+    def __init__(
+        self,
+        url: str,
+        max_clients: int = 100,
+        idle_timeout: float = 600.0,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        **client_options: Any,
+    ) -> None:
+        self.url = url
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        # One breaker per host for every user, the API is down for all of them
+        self.breakers = client_options.setdefault("breakers", CircuitBreakers())
+        self.client_options = client_options
+        self.limits = limits or AsyncHTTPXClient.DEFAULT_LIMITS
+        # Every user's client sends through this one pool, a token only
+        # changes the Authorization header. Closing a client therefore frees
+        # no sockets, idle connections expire after limits.keepalive_expiry
+        self.transport = CountingTransport(
+            httpx.AsyncHTTPTransport(limits=self.limits, http2=http2)
+        )
+        self.clients: OrderedDict[str, ClientEntry] = OrderedDict()
+        # Rate limits are per account, so a limiter outlives its evicted
+        # client until it has refilled and a new one would be no different
+        self.rate_limiters: dict[str, RateLimiter] = dict()
+        self.created = 0
+        self.evicted = 0
+        self.logger = logging.getLogger(__name__)
+
+    async def get(self, token: str) -> AsyncHTTPXClient:
+        entry = self._checkout(token)
+        await self.evict()
+        return entry.client
+
+    @asynccontextmanager
+    async def lease(self, token: str) -> AsyncIterator[AsyncHTTPXClient]:
+        # A leased client is never evicted, even past max_clients
+        entry = self._checkout(token)
+        entry.leases += 1
+        try:
+            await self.evict()
+            yield entry.client
+        finally:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            if self.clients.get(token) is entry:
+                self.clients.move_to_end(token)
+
+    def _checkout(self, token: str) -> ClientEntry:
+        entry = self.clients.get(token)
+        if entry is None:
+            rate_limiter = self.rate_limiters.setdefault(token, RateLimiter())
+            entry = ClientEntry(
+                AsyncHTTPXClient(
+                    self.url,
+                    auth_headers(token),
+                    rate_limiter=rate_limiter,
+                    transport=self.transport,
+                    **self.client_options,
+                ),
+                time.monotonic(),
+            )
+            self.clients[token] = entry
+            self.created += 1
+        else:
+            entry.last_used = time.monotonic()
+            self.clients.move_to_end(token)
+        return entry
+
+    async def evict(self) -> int:
+        # Least recently used first, so the idle ones are all at the front
+        now = time.monotonic()
+        expired = list()
+        overflow = len(self.clients) - self.max_clients
+        newest = next(reversed(self.clients), None)
+        for token, entry in self.clients.items():
+            idle = now - entry.last_used >= self.idle_timeout
+            if not idle and (overflow <= 0 or token == newest):
+                break
+            if entry.leases:
+                continue
+            expired.append(token)
+            overflow -= 1
+
+        # Unlinked before closing, so a concurrent get() can't pick them up
+        entries = [self.clients.pop(token) for token in expired]
+        for entry in entries:
+            await entry.client.close()
+        self.evicted += len(entries)
+        for token in [
+            token
+            for token, rate_limiter in self.rate_limiters.items()
+            if token not in self.clients and rate_limiter.at_rest()
+        ]:
+            del self.rate_limiters[token]
+        if entries:
+            self.logger.debug(f"Evicted {len(entries)} API clients")
+        return len(entries)
+
+    async def remove(self, token: str) -> None:
+        entry = self.clients.pop(token, None)
+        if entry is not None:
+            await entry.client.close()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "clients": len(self.clients),
+            "max_clients": self.max_clients,
+            "leased": sum(1 for entry in self.clients.values() if entry.leases),
+            "created": self.created,
+            "evicted": self.evicted,
+            "rate_limiters": len(self.rate_limiters),
+            "requests_active": self.transport.active,
+            "requests_peak": self.transport.peak,
+            "max_connections": self.limits.max_connections or 0,
+        }
+
+    async def close(self) -> None:
+        for entry in self.clients.values():
+            await entry.client.close()
+        self.clients.clear()
+        await self.transport.aclose()
@@ -0,0 +1,18 @@
+import json
+from functools import cache
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+
+@cache
+def type_adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def decode(content: bytes, response_type: Any = None) -> Any:
+    if response_type is None:
+        return json.loads(content)
+    if isinstance(response_type, type) and issubclass(response_type, BaseModel):
+        return response_type.model_validate_json(content)
+    return type_adapter(response_type).validate_json(content)
@@ -1,8 +1,11 @@
 import logging
-from re import sub
+from pathlib import Path
 from typing import Any
 
 from .file import FileWriterProtocol, LocalFileWriter
+from .manifest import GenerationManifest, content_hash
+from .spec_cache import SpecCache
+from .type_resolver import camel_to_snake
 from src.api.client import HTTPClientProtocol
 from .models_generator import (
     EnumSchemaParser,
@@ -21,16 +24,24 @@ class OpenAPIGenerator:
         file_writer: FileWriterProtocol,
         models_path: str = "./src/api/models",
         endpoints_path: str = "./src/api/endpoints",
+        incremental: bool = False,
+        prewarm_models: list[str] | None = None,
     ) -> None:
         self.openapi = openapi
         self.models_path = models_path
         self.endpoints_path = endpoints_path
         self.file_writer = file_writer
+        self.incremental = incremental
+        self.prewarm_models = prewarm_models or list()
+        self.manifest = GenerationManifest(
+            f"{Path(models_path).parent}/.codegen_manifest.json", file_writer
+        )
+        object_parser = ObjectParser()
         self.parsers = {
-            "object": ObjectParser(),
+            "object": object_parser,
             "enum": EnumSchemaParser(),
             "datapage": DataPageSchemaParser(),
-            "endpoint": EndpointParser(),
+            "endpoint": EndpointParser(object_parser),
         }
 
         logging.basicConfig(level=logging.INFO)
@@ -44,37 +55,112 @@ class OpenAPIGenerator:
         openapi_url: str = "openapi.json",
         models_path: str = "./src/api/models",
         endpoints_path: str = "./src/api/endpoints",
+        incremental: bool = False,
+        spec_cache: SpecCache | None = None,
+        prewarm_models: list[str] | None = None,
     ):
         try:
-            openapi = await http_client.get(openapi_url)
-            return cls(openapi[1], file_writer, models_path, endpoints_path)
+            if spec_cache is not None:
+                openapi = await spec_cache.load(http_client, openapi_url)
+            else:
+                _, openapi = await http_client.get(openapi_url)
+            return cls(
+                openapi,
+                file_writer,
+                models_path,
+                endpoints_path,
+                incremental,
+                prewarm_models,
+            )
         finally:
             await http_client.close()
 
     async def generate_models(self) -> None:
+        init_template = """from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+{type_imports}
+
+_MODULES = {{
+{modules}
+}}
+
+PREWARM = [{prewarm}]
+
+__all__ = [{all_content}]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _MODULES:
+        raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+    value = getattr(import_module(_MODULES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
+
+
+def prewarm(names: list[str] = PREWARM) -> None:
+    for name in names:
+        model = __getattr__(name)
+        if hasattr(model, "model_rebuild"):
+            model.model_rebuild()
+"""
         models = self.openapi["components"]["schemas"]
-        init_content = list()
-        all_content = list()
-        for model in models.values():
+        entries = dict()
+        for schema_name, model in models.items():
+            digest = content_hash(model)
+            if self.incremental and self.manifest.unchanged(
+                "models", schema_name, digest, self.models_path
+            ):
+                entries[schema_name] = self.manifest.entries("models")[schema_name]
+                continue
+
             model_name, file_content = self._resolve_model(model)
+            file_name = None
             if file_content and model_name:
                 snake_name = (
                     self._camel_to_snake(model_name).rstrip("_").replace("__", "_")
                 )  # Make a snake case name without unnecessary underscores
-                self.file_writer.write(
-                    f"{self.models_path}/{snake_name}.py", file_content
-                )
-
-                init_content.append(f"from .{snake_name} import {model_name}")
-                all_content.append('"' + model_name + '"')
+                file_name = f"{snake_name}.py"
+                self.file_writer.write(f"{self.models_path}/{file_name}", file_content)
+
+            entries[schema_name] = {
+                "hash": digest,
+                "file": file_name,
+                "name": model_name,
+            }
+
+        self._delete_stale("models", entries, self.models_path)
+        type_imports = list()
+        modules = list()
+        all_content = list()
+        for entry in entries.values():
+            if entry["file"]:
+                module = entry["file"].removesuffix(".py")
+                type_imports.append(f"    from .{module} import {entry['name']}")
+                modules.append(f'    "{entry["name"]}": ".{module}",')
+                all_content.append('"' + entry["name"] + '"')
 
         self.file_writer.write(
             f"{self.models_path}/__init__.py",
-            "\n".join(init_content) + f"\n__all__ = [{', '.join(all_content)}]\n",
+            init_template.format(
+                type_imports="\n".join(type_imports) or "    pass",
+                modules="\n".join(modules),
+                prewarm=", ".join(f'"{name}"' for name in self.prewarm_models),
+                all_content=", ".join(all_content),
+            ),
         )
+        self.manifest.save("models", entries)
 
     async def generate_endpoints(self) -> None:
-        endpoint_template = """from src.api.client import HTTPClientProtocol
+        endpoint_template = """from typing import Any, Iterable
+
+from src.api.bulk import BulkRun
+from src.api.client import HTTPClientProtocol
 from src.api.models import {models}
 
 
@@ -84,38 +170,68 @@ class {endpoint_name}:
 
 {methods}"""
         endpoints = self.openapi["paths"]
-        init_content = list()
-        endpoint_tags = dict()
-        all_content = list()
-
+        tag_paths = dict()
         for endpoint_path, endpoint in endpoints.items():
-            default_tag, tag, imports, method = self.parsers["endpoint"].parse(
-                endpoint_path, endpoint
-            )
+            tag = next(iter(endpoint.values()))["tags"][0]
+            tag_paths.setdefault(tag, dict())[endpoint_path] = endpoint
+
+        entries = dict()
+        generated = list()
+        for tag, paths in tag_paths.items():
+            digest = content_hash(paths)
+            if self.incremental and self.manifest.unchanged(
+                "endpoints", tag, digest, self.endpoints_path
+            ):
+                entries[tag] = self.manifest.entries("endpoints")[tag]
+                continue
+
+            imports = set()
+            methods = ""
+            for endpoint_path, endpoint in paths.items():
+                default_tag, tag_snake, endpoint_imports, method = self.parsers[
+                    "endpoint"
+                ].parse(endpoint_path, endpoint)
+                imports.update(endpoint_imports)
+                methods += method
 
-            new_endpoint_tags = endpoint_tags.setdefault(tag, [set(), default_tag, ""])
-            new_endpoint_tags[0].update(imports)
-            new_endpoint_tags[2] += method
-            endpoint_tags[tag] = new_endpoint_tags
-
-        print(endpoint_tags.keys())
-
-        for tag, endpoint_content in endpoint_tags.items():
-            init_content.append(f"from .{tag} import {endpoint_content[1]}")
-            all_content.append('"' + endpoint_content[1] + '"')
             self.file_writer.write(
-                f"{self.endpoints_path}/{tag}.py",
+                f"{self.endpoints_path}/{tag_snake}.py",
                 endpoint_template.format(
-                    models=", ".join(endpoint_content[0]),
-                    endpoint_name=endpoint_content[1],
-                    methods=endpoint_content[2],
+                    models=", ".join(sorted(imports)),
+                    endpoint_name=default_tag,
+                    methods=methods,
                 ),
             )
+            entries[tag] = {
+                "hash": digest,
+                "file": f"{tag_snake}.py",
+                "name": default_tag,
+            }
+            generated.append(tag)
+
+        self.logger.info(f"Generated endpoints: {', '.join(generated) or 'none'}")
+        self._delete_stale("endpoints", entries, self.endpoints_path)
+        init_content = list()
+        all_content = list()
+        for entry in entries.values():
+            init_content.append(
+                f"from .{entry['file'].removesuffix('.py')} import {entry['name']}"
+            )
+            all_content.append('"' + entry["name"] + '"')
 
         self.file_writer.write(
             f"{self.endpoints_path}/__init__.py",
             "\n".join(init_content) + f"\n__all__ = [{', '.join(all_content)}]\n",
         )
+        self.manifest.save("endpoints", entries)
+
+    def _delete_stale(
+        self, section: str, entries: dict[str, dict[str, Any]], directory: str
+    ) -> None:
+        current_files = {entry["file"] for entry in entries.values()}
+        for entry in self.manifest.entries(section).values():
+            if entry["file"] and entry["file"] not in current_files:
+                self.file_writer.delete(f"{directory}/{entry['file']}")
 
     def _resolve_model(self, model: dict[str, Any]) -> tuple[str | None, str | None]:
         if "properties" in model:
@@ -131,10 +247,7 @@ class {endpoint_name}:
             return None, None
         return parser.parse(model)
 
-    @staticmethod
-    def _camel_to_snake(name: str) -> str:
-        name = sub(r"(.)([A-Z][a-z]+)", r"\1_\2", name)
-        return sub(r"([a-z0-9])([A-Z])", r"\1_\2", name).lower()
+    _camel_to_snake = staticmethod(camel_to_snake)
 
 
-__all__ = ["LocalFileWriter"]
+__all__ = ["LocalFileWriter", "SpecCache"]
@@ -1,12 +1,12 @@
-from re import sub
 from typing import Any
 import logging
 
 from src.api.generators.object_parser import ObjectParser
+from src.api.generators.type_resolver import camel_to_snake
 
 
 class EndpointParser:
-    def __init__(self):
+    def __init__(self, object_parser: ObjectParser | None = None):
         self.changed_types = {
             "string": "str",
             "integer": "int",
@@ -16,7 +16,7 @@ class EndpointParser:
         }
 
         self.logger = logging.getLogger(__name__)
-        self.object_parser = ObjectParser()
+        self.object_parser = object_parser or ObjectParser()
 
         self.status_codes_template = """            case {status_code}:
                 return "{description}"{reference}
@@ -39,6 +39,14 @@ class EndpointParser:
 {status_codes}            case _:
                 return "Unknown status code.", None
 
+    def {method_name}_bulk(
+        self, arguments: Iterable[Any], concurrency: int = 8
+    ) -> BulkRun:
+        """Bulk variant of {method_name}, results keep input order."""
+        return BulkRun(
+            self.{method_name}, arguments, concurrency, {status_code_table}
+        )
+
 '''
 
     def parse(
@@ -90,6 +98,7 @@ class EndpointParser:
                 request_body=request_body,
                 response_model=response_model,
                 status_codes=status_codes,
+                status_code_table=self._status_code_table(endpoint["responses"]),
             ),
         )
 
@@ -156,6 +165,17 @@ class EndpointParser:
 
         return model, status_codes
 
+    @staticmethod
+    def _status_code_table(responses: dict[str, Any]) -> str:
+        # "default" and ranges like "4XX" are valid keys but not status codes
+        return repr(
+            {
+                int(status_code): response["description"]
+                for status_code, response in responses.items()
+                if status_code.isdigit()
+            }
+        )
+
     def _parse_parameters(
         self, endpoint: tuple[dict[str, Any]]
     ) -> tuple[str, str, list[str | None]]:
@@ -179,12 +199,4 @@ class EndpointParser:
 
         return parameters, endpoint_parameter, imports
 
-    @staticmethod
-    def _camel_to_snake(name: str) -> str:
-        name = sub(r"(.)([A-Z][a-z]+)", r"\1_\2", name)
-        return (
-            sub(r"([a-z0-9])([A-Z])", r"\1_\2", name)
-            .lower()
-            .replace(" _", "_")
-            .replace(" ", "_")
-        )
+    _camel_to_snake = staticmethod(camel_to_snake)
@@ -6,10 +6,36 @@ class FileWriterProtocol(Protocol):
     def write(self, file_path: str, content: str) -> None:
         pass
 
+    def delete(self, file_path: str) -> None:
+        pass
+
+    def read(self, file_path: str) -> str | None:
+        pass
+
+    def exists(self, file_path: str) -> bool:
+        pass
+
 
 class LocalFileWriter:
     @staticmethod
     def write(file_path: str, content: str) -> None:
-        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+        path = Path(file_path)
+        if path.exists() and path.read_text() == content:
+            return  # Keep the mtime so cached bytecode stays valid
+
+        path.parent.mkdir(parents=True, exist_ok=True)
         with open(file_path, "w") as f:
             f.write(content)
+
+    @staticmethod
+    def delete(file_path: str) -> None:
+        Path(file_path).unlink(missing_ok=True)
+
+    @staticmethod
+    def read(file_path: str) -> str | None:
+        path = Path(file_path)
+        return path.read_text() if path.exists() else None
+
+    @staticmethod
+    def exists(file_path: str) -> bool:
+        return Path(file_path).exists()
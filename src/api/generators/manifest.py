@@ -0,0 +1,59 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from .file import FileWriterProtocol
+
+
+def content_hash(value: Any) -> str:
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+def generator_hash() -> str:
+    # Any change to the generator itself invalidates every generated file
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.rglob("*.py")):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class GenerationManifest:
+    def __init__(self, path: str, file_writer: FileWriterProtocol) -> None:
+        self.path = Path(path)
+        self.file_writer = file_writer
+        self.generator = generator_hash()
+        self.sections: dict[str, dict[str, dict[str, Any]]] = {}
+
+        content = self.file_writer.read(str(self.path))
+        if content is not None:
+            manifest = json.loads(content)
+            if manifest.get("generator") == self.generator:
+                self.sections = manifest["sections"]
+
+    def entries(self, section: str) -> dict[str, dict[str, Any]]:
+        return self.sections.get(section, {})
+
+    def unchanged(self, section: str, key: str, digest: str, directory: str) -> bool:
+        entry = self.entries(section).get(key)
+        return (
+            entry is not None
+            and entry["hash"] == digest
+            and (
+                entry["file"] is None
+                or self.file_writer.exists(f"{directory}/{entry['file']}")
+            )
+        )
+
+    def save(self, section: str, entries: dict[str, dict[str, Any]]) -> None:
+        self.sections[section] = entries
+        self.file_writer.write(
+            str(self.path),
+            json.dumps(
+                {"generator": self.generator, "sections": self.sections},
+                indent=2,
+                sort_keys=True,
+            ),
+        )
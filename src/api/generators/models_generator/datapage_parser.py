@@ -1,18 +1,10 @@
-from pydantic import BaseModel
 from typing import Any
 from .parser import SchemaParser
 
 
-class DataPage(BaseModel):
-    total: int | None
-    page: int | None
-    size: int | None
-    pages: int | None
-
-
 class DataPageSchemaParser(SchemaParser):
     def __init__(self):
-        self.model_template = """from src.api.models_generator.datapage import DataPage
+        self.model_template = """from src.api.pagination import DataPage
 from .{ref_type_snake} import {ref_type}
 
 class {datapage_name}(DataPage):
@@ -1,6 +1,7 @@
 import logging
 from typing import Any
-from re import sub
+
+from .type_resolver import resolve_reference
 
 
 class ObjectParser:
@@ -13,12 +14,18 @@ class ObjectParser:
             "boolean": "bool",
         }
 
+        # Component schema name -> (imports, type), every model and endpoint
+        # referencing a schema reuses its first resolution
+        self.resolved: dict[str, tuple[str, str]] = dict()
+
         self.logger = logging.getLogger(__name__)
 
-        self.model_template = """from pydantic import BaseModel
+        self.model_template = """from pydantic import BaseModel, ConfigDict
 {imports}
 
 class {schema_name}(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
 {properties}
 """
 
@@ -64,13 +71,10 @@ class {schema_name}(BaseModel):
         return "from typing import Any\n", "Any"
 
     def _resolve_reference(self, prop: dict[str, Any]) -> tuple[str, str]:
-        ref_type = prop["$ref"].split("/")[-1]
-        if ref_type.startswith("DataPage"):
-            ref_type = ref_type.replace("_", "")
-        if "_a-z" in ref_type:
-            ref_type = ref_type[: ref_type.find("_a-z")]
-        snake_ref = self._camel_to_snake(ref_type)
-        return f"from .{snake_ref} import {ref_type}\n", ref_type
+        schema_name = prop["$ref"].split("/")[-1]
+        if schema_name not in self.resolved:
+            self.resolved[schema_name] = resolve_reference(prop["$ref"])
+        return self.resolved[schema_name]
 
     def _make_any_of(self, prop: dict[str, Any]) -> tuple[str, str]:
         imports = list()
@@ -81,8 +85,3 @@ class {schema_name}(BaseModel):
             if item_type:
                 prop_types.append(item_type)
         return "\n".join(sorted(set(imports))), " | ".join(prop_types)
-
-    @staticmethod
-    def _camel_to_snake(name: str) -> str:
-        name = sub(r"(.)([A-Z][a-z]+)", r"\1_\2", name)
-        return sub(r"([a-z0-9])([A-Z])", r"\1_\2", name).lower().replace(" ", "_")
@@ -0,0 +1,77 @@
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from src.api.client import HTTPClientProtocol
+
+
+class SpecCache:
+    def __init__(
+        self,
+        directory: str = "./.cache/openapi",
+        offline: bool = False,
+        snapshot: str | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.offline = offline
+        self.snapshot = Path(snapshot) if snapshot else None
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def spec_path(self) -> Path:
+        return self.directory / "openapi.json"
+
+    @property
+    def meta_path(self) -> Path:
+        return self.directory / "openapi.meta.json"
+
+    async def load(
+        self, http_client: HTTPClientProtocol, openapi_url: str = "openapi.json"
+    ) -> Any:
+        if self.snapshot is not None:
+            path = (
+                self.snapshot / "openapi.json"
+                if self.snapshot.is_dir()
+                else self.snapshot
+            )
+            self.logger.info(f"Using OpenAPI snapshot {path}")
+            return json.loads(path.read_bytes())
+
+        if self.offline:
+            if not self.spec_path.exists():
+                raise FileNotFoundError(
+                    f"No cached OpenAPI spec at {self.spec_path} for offline mode"
+                )
+            return json.loads(self.spec_path.read_bytes())
+
+        meta = self._read_meta()
+        headers = dict()
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = await http_client.request("GET", openapi_url, headers=headers)
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            self.logger.info("OpenAPI spec not modified, using cached copy")
+            return json.loads(self.spec_path.read_bytes())
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.spec_path.write_bytes(response.content)
+        self.meta_path.write_text(
+            json.dumps(
+                {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+            )
+        )
+        return json.loads(response.content)
+
+    def _read_meta(self) -> dict[str, str | None]:
+        if not (self.spec_path.exists() and self.meta_path.exists()):
+            return {}
+        return json.loads(self.meta_path.read_text())
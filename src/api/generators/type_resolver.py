@@ -0,0 +1,24 @@
+from functools import cache
+from re import sub
+
+
+@cache
+def camel_to_snake(name: str) -> str:
+    name = sub(r"(.)([A-Z][a-z]+)", r"\1_\2", name)
+    return (
+        sub(r"([a-z0-9])([A-Z])", r"\1_\2", name)
+        .lower()
+        .replace(" _", "_")
+        .replace(" ", "_")
+    )
+
+
+@cache
+def resolve_reference(reference: str) -> tuple[str, str]:
+    ref_type = reference.split("/")[-1]
+    if ref_type.startswith("DataPage"):
+        ref_type = ref_type.replace("_", "")
+    if "_a-z" in ref_type:
+        ref_type = ref_type[: ref_type.find("_a-z")]
+    snake_ref = camel_to_snake(ref_type)
+    return f"from .{snake_ref} import {ref_type}\n", ref_type
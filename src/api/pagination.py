@@ -0,0 +1,83 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DataPage(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    total: int | None
+    page: int | None
+    size: int | None
+    pages: int | None
+
+
+PageFetcher = Callable[..., Awaitable[Any]]
+
+
+class Paginator:
+    def __init__(
+        self,
+        fetch_page: PageFetcher,
+        size: int = 100,
+        concurrency: int = 4,
+        ordered: bool = True,
+        **params: Any,
+    ) -> None:
+        self.fetch_page = fetch_page
+        self.size = size
+        self.concurrency = concurrency
+        self.ordered = ordered
+        self.params = params
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def fetch_all(self) -> list[Any]:
+        return [item async for item in self]
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        first_page = await self._fetch(1)
+        if first_page is None:
+            return
+        for item in first_page.data:
+            yield item
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(page: int) -> DataPage | None:
+            async with semaphore:
+                return await self._fetch(page)
+
+        tasks = [
+            asyncio.create_task(fetch(page))
+            for page in range(2, (first_page.pages or 1) + 1)
+        ]
+        try:
+            pages = tasks if self.ordered else asyncio.as_completed(tasks)
+            for task in pages:
+                data_page = await task
+                if data_page is not None:
+                    for item in data_page.data:
+                        yield item
+        finally:
+            # Awaited so a consumer stopping early leaves no pending tasks or
+            # unretrieved exceptions behind
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch(self, page: int) -> DataPage | None:
+        result = await self.fetch_page(page=page, size=self.size, **self.params)
+        if isinstance(result, tuple):  # Generated endpoints return (status, model)
+            result = result[-1]
+        return result
+
+
+async def fetch_all(
+    fetch_page: PageFetcher, size: int = 100, concurrency: int = 4, **params: Any
+) -> list[Any]:
+    return await Paginator(
+        fetch_page, size, concurrency, ordered=True, **params
+    ).fetch_all()
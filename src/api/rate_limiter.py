@@ -0,0 +1,117 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.waiting = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        self.waiting += 1
+        try:
+            # asyncio.Lock is FIFO, so waiters are served in arrival order
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if now < self.paused_until:
+                        await asyncio.sleep(self.paused_until - now)
+                    elif self.tokens < 1:
+                        await asyncio.sleep((1 - self.tokens) / self.rate)
+                    else:
+                        self.tokens -= 1
+                        return
+        finally:
+            self.waiting -= 1
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        self._refill(now)
+        if now < self.paused_until or self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def at_rest(self) -> bool:
+        # Full and not paused, indistinguishable from a fresh bucket
+        now = time.monotonic()
+        self._refill(now)
+        return self.tokens >= self.capacity and now >= self.paused_until
+
+    def pause(self, seconds: float) -> None:
+        now = time.monotonic()
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = 0
+        self.updated_at = now
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated_at:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+
+
+class RateLimiter:
+    # Requests per second and burst size for each endpoint class of ArtifactsMMO
+    DEFAULT_LIMITS = {
+        "action": (3.5, 7),
+        "data": (16.0, 16),
+        "token": (3.0, 3),
+    }
+
+    def __init__(self, limits: dict[str, tuple[float, float]] | None = None) -> None:
+        self.buckets = {
+            endpoint_class: TokenBucket(rate, capacity)
+            for endpoint_class, (rate, capacity) in (
+                limits or self.DEFAULT_LIMITS
+            ).items()
+        }
+
+    def bucket_for(self, method: str, url: str) -> TokenBucket:
+        return self.buckets[self.classify(method, url)]
+
+    @staticmethod
+    def classify(method: str, url: str) -> str:
+        path = urlsplit(url).path.rstrip("/")
+        if path.endswith("/token"):
+            return "token"
+        if method.upper() == "POST" and "/action/" in path:
+            return "action"
+        return "data"
+
+    def at_rest(self) -> bool:
+        return all(
+            bucket.at_rest() and not bucket.waiting for bucket in self.buckets.values()
+        )
+
+    def queue_depth(self) -> dict[str, int]:
+        return {
+            endpoint_class: bucket.waiting
+            for endpoint_class, bucket in self.buckets.items()
+        }
+
+
+def parse_retry_after(value: str | None, default: float = 1.0) -> float:
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:  # "-0000" dates are UTC without an offset
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,143 @@
+import json
+import random
+import re
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+# The request never reached the server, so even an action can't have applied
+PRE_SEND_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+COOLDOWN_SECONDS = re.compile(r"(\d+(?:\.\d+)?) seconds")
+
+
+class CircuitOpenError(httpx.TransportError):
+    pass
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.25,
+        max_delay: float = 10.0,
+        retry_statuses: frozenset[int] = frozenset({500, 502, 503, 504}),
+        # 486: an action is already in progress, 499: the character is in
+        # cooldown. Both reject the action before it runs
+        unapplied_statuses: frozenset[int] = frozenset({486, 499}),
+        seed: int | None = None,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+        self.unapplied_statuses = unapplied_statuses
+        self.random = random.Random(seed)
+
+    def retry_error(self, method: str, attempt: int, error: Exception) -> bool:
+        if attempt + 1 >= self.max_attempts or isinstance(error, CircuitOpenError):
+            return False
+        if method.upper() == "GET":
+            return isinstance(error, httpx.TransportError)
+        return isinstance(error, PRE_SEND_ERRORS)
+
+    def retry_status(self, method: str, attempt: int, status_code: int) -> bool:
+        if attempt + 1 >= self.max_attempts:
+            return False
+        if method.upper() == "GET":
+            return status_code in self.retry_statuses
+        # A 5xx after an action was sent may still have applied it
+        return status_code in self.unapplied_statuses
+
+    def delay(self, attempt: int, response: httpx.Response | None = None) -> float:
+        # Full jitter, so characters that failed together don't retry together
+        delay = self.random.uniform(
+            0, min(self.max_delay, self.base_delay * 2**attempt)
+        )
+        if response is not None and response.status_code == 499:
+            delay += cooldown_remaining(response)
+        return delay
+
+
+def cooldown_remaining(response: httpx.Response) -> float:
+    try:
+        message = json.loads(response.content)["error"]["message"]
+    except (ValueError, KeyError, TypeError):
+        return 0.0
+    match = COOLDOWN_SECONDS.search(str(message))
+    return float(match.group(1)) if match else 0.0
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            # A single probe decides whether the host is back
+            if self.probing:
+                self.rejected += 1
+                return False
+            self.probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probing = False
+
+    def release(self) -> None:
+        # The probe ended without an outcome, e.g. it was cancelled
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict[str, str | int | float]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "retry_in": (
+                max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0)
+                if self.state == self.OPEN
+                else 0.0
+            ),
+        }
+
+
+class CircuitBreakers:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers: dict[str, CircuitBreaker] = dict()
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc.lower()
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker(
+                self.failure_threshold, self.reset_timeout
+            )
+        return self.breakers[host]
+
+    def stats(self) -> dict[str, dict[str, str | int | float]]:
+        return {host: breaker.stats() for host, breaker in self.breakers.items()}
@@ -0,0 +1,151 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+Action = Callable[[], Awaitable[Any]]
+
+
+def parse_datetime(value: Any) -> datetime | None:
+    if isinstance(value, str):  # Generated models keep date-time fields as str
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    # The API sends UTC, a missing offset must not make the value naive
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def cooldown_expiration(response: Any) -> datetime | None:
+    if isinstance(response, tuple):  # (status, model) from clients and endpoints
+        response = response[-1]
+    data = getattr(response, "data", None)
+    cooldown = getattr(data, "cooldown", None)
+    expiration = parse_datetime(getattr(cooldown, "expiration", None))
+    if expiration is not None:
+        return expiration
+    remaining = getattr(cooldown, "remaining_seconds", None)
+    if isinstance(remaining, (int, float)):
+        return datetime.now(timezone.utc) + timedelta(seconds=remaining)
+    return None
+
+
+class CooldownScheduler:
+    def __init__(self) -> None:
+        self._ready_heap: list[tuple[float, int, str]] = []
+        self._queues: dict[str, deque[tuple[Action, asyncio.Future]]] = {}
+        self._ready_at: dict[str, float] = {}
+        self._scheduled: set[str] = set()
+        self._busy: set[str] = set()
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._running: set[asyncio.Task] = set()
+        self._task: asyncio.Task | None = None
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def submit(self, character_name: str, action: Action) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(character_name, deque()).append((action, future))
+        self._schedule(character_name)
+        return future
+
+    def set_cooldown(self, character_name: str, expiration: datetime) -> None:
+        remaining = (expiration - datetime.now(timezone.utc)).total_seconds()
+        self._ready_at[character_name] = asyncio.get_running_loop().time() + max(
+            remaining, 0.0
+        )
+
+    def cooled_down(self, character_name: str) -> bool:
+        # Only known once a response in this process set the cooldown
+        ready_at = self._ready_at.get(character_name)
+        return ready_at is not None and ready_at <= asyncio.get_running_loop().time()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for task in list(self._running):
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _schedule(self, character_name: str) -> None:
+        if (
+            character_name in self._busy
+            or character_name in self._scheduled
+            or not self._queues.get(character_name)
+        ):
+            return
+
+        ready_at = self._ready_at.get(character_name, 0.0)
+        heapq.heappush(
+            self._ready_heap, (ready_at, next(self._counter), character_name)
+        )
+        self._scheduled.add(character_name)
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            while self._ready_heap and self._ready_heap[0][0] <= now:
+                _, _, character_name = heapq.heappop(self._ready_heap)
+                self._scheduled.discard(character_name)
+                self._dispatch(character_name)
+
+            self._wakeup.clear()
+            timeout = self._ready_heap[0][0] - now if self._ready_heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+
+    def _dispatch(self, character_name: str) -> None:
+        action, future = self._queues[character_name].popleft()
+        if not self._queues[character_name]:
+            del self._queues[character_name]
+        if future.cancelled():
+            self._schedule(character_name)
+            return
+
+        self._busy.add(character_name)
+        task = asyncio.create_task(self._execute(character_name, action, future))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _execute(
+        self, character_name: str, action: Action, future: asyncio.Future
+    ) -> None:
+        try:
+            response = await action()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.logger.warning(f"Action of {character_name} failed: {e}")
+            if not future.done():
+                future.set_exception(e)
+        else:
+            expiration = cooldown_expiration(response)
+            if expiration is not None:
+                self.set_cooldown(character_name, expiration)
+            if not future.done():
+                future.set_result(response)
+        finally:
+            self._busy.discard(character_name)
+            self._schedule(character_name)
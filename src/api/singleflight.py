@@ -0,0 +1,60 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+KeyNormalizer = Callable[[str, str], Hashable]
+
+
+def normalize_key(method: str, url: str) -> Hashable:
+    # Parameter order, host case and trailing slashes don't change the response
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return (
+        method.upper(),
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip("/"),
+        query,
+    )
+
+
+class SingleFlight:
+    def __init__(self, normalize: KeyNormalizer | None = None) -> None:
+        self.normalize = normalize or normalize_key
+        self.inflight: dict[Hashable, asyncio.Task] = dict()
+        self.requests = 0
+        self.collapsed = 0
+
+    async def do(
+        self,
+        method: str,
+        url: str,
+        call: Callable[[], Awaitable[Any]],
+        identity: Hashable = None,
+    ) -> Any:
+        # Callers with different credentials never share a response
+        key = (identity, self.normalize(method, url))
+        task = self.inflight.get(key)
+        if task is None:
+            # The request runs in its own task so a cancelled caller doesn't
+            # cancel it for everyone else waiting on it
+            task = asyncio.ensure_future(call())
+            self.inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.requests += 1
+        else:
+            self.collapsed += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "requests": self.requests,
+            "collapsed": self.collapsed,
+            "inflight": len(self.inflight),
+        }
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here in case every caller went away
@@ -1,3 +1,5 @@
+from urllib.parse import urlsplit
+
 from aiogram import Bot, Dispatcher, types
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
@@ -5,34 +7,62 @@ from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.methods import DeleteWebhook
 from aiogram_dialog import setup_dialogs
 
+from src.api import ClientRegistry
+from src.api import models as api_models
 from src.config import settings
 
 # from app.database import Database
 from src.bot.handlers import setup_routers
 
 # from src.bot.middlewares.database import DatabaseMiddleware
+from src.bot.middlewares.metrics import (
+    TelegramMetricsMiddleware,
+    UpdateMetricsMiddleware,
+)
+from src.bot.middlewares.send_queue import SendQueue
 from src.bot.middlewares.throttling import ThrottlingMiddleware
+from src.bot.storage import CachedRedisStorage
+from src.bot.webhook import WebhookServer
+from src.metrics import ClientMetrics, registry, serve_metrics
 
 bot = Bot(
     token=settings.bot_token,
     default=DefaultBotProperties(parse_mode=ParseMode.MARKDOWN),
 )
-
-storage = MemoryStorage()
+# Every outgoing message goes through the send queue; wrap broadcasts in
+# `send_queue.broadcasting()` so interactive replies overtake them
+send_queue = SendQueue()
+bot.session.middleware(send_queue)
+bot.session.middleware(TelegramMetricsMiddleware(registry))
+
+if settings.redis_url:
+    storage = CachedRedisStorage.from_url(
+        settings.redis_url, local_cache_size=settings.fsm_local_cache_size
+    )
+else:
+    storage = MemoryStorage()
+# One API client per user token, handlers get it as `api_clients`
+api_clients = ClientRegistry(
+    settings.artifacts_url,
+    settings.api_max_clients,
+    settings.api_client_idle_timeout,
+    hooks=[ClientMetrics(registry, urlsplit(settings.artifacts_url).path)],
+)
 # db = Database()
-dp = Dispatcher(storage=storage)
+dp = Dispatcher(storage=storage, api_clients=api_clients)
 
 
 async def on_startup() -> None:
-    await bot(DeleteWebhook(drop_pending_updates=True))
-
     await db.init_db()
+    # Builds the PREWARM_MODELS validators now, not on the first request
+    api_models.prewarm()
 
     router = setup_routers()
     dp.include_routers(router)
 
     setup_dialogs(dp)
 
+    dp.update.outer_middleware(UpdateMetricsMiddleware(registry))
     dp.update.outer_middleware(DatabaseMiddleware(db))
 
     dp.message.middleware(ThrottlingMiddleware())
@@ -43,12 +73,45 @@ async def on_startup() -> None:
         types.BotCommandScopeDefault(),
     )
 
+    if settings.bot_mode == "webhook":
+        await bot.set_webhook(
+            settings.webhook_url + settings.webhook_path,
+            secret_token=settings.webhook_secret,
+            allowed_updates=dp.resolve_used_update_types(),
+            drop_pending_updates=True,
+        )
+    else:
+        await bot(DeleteWebhook(drop_pending_updates=True))
+
 
 async def on_shutdown() -> None:
     await db.dispose()
+    await api_clients.close()
 
 
 async def main() -> None:
     dp.startup.register(on_startup)
     dp.shutdown.register(on_shutdown)
-    await dp.start_polling(bot)
+    metrics_runner = None
+    if settings.metrics_port:
+        metrics_runner = await serve_metrics(
+            registry, settings.metrics_host, settings.metrics_port
+        )
+
+    try:
+        if settings.bot_mode == "webhook":
+            await WebhookServer(
+                dp,
+                bot,
+                settings.webhook_secret,
+                settings.webhook_path,
+                settings.webhook_host,
+                settings.webhook_port,
+                settings.webhook_workers,
+                settings.webhook_queue_size,
+            ).run()
+        else:
+            await dp.start_polling(bot)
+    finally:
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
@@ -0,0 +1,73 @@
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.methods import TelegramMethod
+from aiogram.types import TelegramObject, Update
+
+from src.metrics import MetricsRegistry
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.duration = registry.histogram(
+            "bot_update_duration_seconds",
+            "Time spent handling an update, by update type",
+            ("update_type",),
+        )
+        self.updates = registry.counter(
+            "bot_updates_total",
+            "Updates by type and outcome",
+            ("update_type", "outcome"),
+        )
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        update_type = event.event_type if isinstance(event, Update) else "unknown"
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await handler(event, data)
+            outcome = "unhandled" if result is UNHANDLED else "handled"
+            return result
+        finally:
+            self.duration.observe(time.perf_counter() - started, update_type)
+            self.updates.inc(update_type, outcome)
+
+
+class TelegramMetricsMiddleware(BaseRequestMiddleware):
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.duration = registry.histogram(
+            "telegram_request_duration_seconds",
+            "Telegram Bot API latency, by method",
+            ("method",),
+        )
+        self.errors = registry.counter(
+            "telegram_request_errors_total",
+            "Failed Telegram Bot API requests, by method and error",
+            ("method", "error"),
+        )
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod,
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except Exception as e:
+            self.errors.inc(type(method).__name__, type(e).__name__)
+            raise
+        finally:
+            self.duration.observe(time.perf_counter() - started, type(method).__name__)
@@ -0,0 +1,197 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Iterator
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    EditMessageCaption,
+    EditMessageMedia,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    TelegramMethod,
+)
+from cachetools import TTLCache
+
+from src.api.rate_limiter import TokenBucket
+
+COALESCED_EDITS = (
+    EditMessageText,
+    EditMessageCaption,
+    EditMessageMedia,
+    EditMessageReplyMarkup,
+)
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BROADCAST = 1
+
+
+class SendQueue(BaseRequestMiddleware):
+    def __init__(
+        self,
+        rate: float = 30.0,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3,
+        group_rate: float = 20 / 60,
+        max_retries: int = 3,
+    ) -> None:
+        self.global_bucket = TokenBucket(rate, rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate
+        self.max_retries = max_retries
+        # Chats idle for the TTL are forgotten, by then their bucket has
+        # refilled, so a fresh full one behaves the same
+        self.chat_buckets: TTLCache[int | str, TokenBucket] = TTLCache(
+            maxsize=100_000, ttl=600
+        )
+        self.priority: ContextVar[Priority] = ContextVar(
+            "send_priority", default=Priority.INTERACTIVE
+        )
+        self.pending_edits: dict[tuple, list] = dict()
+        self.sent = 0
+        self.coalesced = 0
+        self.retried = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+        self.logger = logging.getLogger(__name__)
+
+    @contextmanager
+    def broadcasting(self) -> Iterator[None]:
+        token = self.priority.set(Priority.BROADCAST)
+        try:
+            yield
+        finally:
+            self.priority.reset(token)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "retried": self.retried,
+            "waiting": len(self._waiters),
+            "pending_edits": len(self.pending_edits),
+        }
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod,
+    ) -> Any:
+        chat_id = getattr(method, "chat_id", None)
+        inline_message_id = getattr(method, "inline_message_id", None)
+        if chat_id is None and inline_message_id is None:
+            return await make_request(bot, method)  # Not a message to a chat
+
+        if not isinstance(method, COALESCED_EDITS):
+            return await self._send(make_request, bot, method, chat_id)
+
+        key = (
+            type(method),
+            chat_id,
+            getattr(method, "message_id", None),
+            inline_message_id,
+        )
+        if key in self.pending_edits:
+            # An edit of this message is still queued; send only the newest one
+            pending = self.pending_edits[key]
+            pending[0] = method
+            self.coalesced += 1
+            return await asyncio.shield(pending[1])
+
+        pending = self.pending_edits[key] = [
+            method,
+            asyncio.get_running_loop().create_future(),
+        ]
+        try:
+            await self._wait_turn(chat_id)
+            # The latest edit is taken only once it is about to be sent
+            method = self.pending_edits.pop(key)[0]
+            result = await self._send(make_request, bot, method, chat_id, waited=True)
+        except Exception as e:
+            pending[1].set_exception(e)
+            pending[1].exception()  # Coalesced callers may not exist to retrieve it
+            raise
+        except BaseException:
+            pending[1].cancel()
+            raise
+        finally:
+            if self.pending_edits.get(key) is pending:
+                del self.pending_edits[key]
+        pending[1].set_result(result)
+        return result
+
+    async def _send(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod,
+        chat_id: int | str | None,
+        waited: bool = False,
+    ) -> Any:
+        for attempt in range(self.max_retries + 1):
+            if not waited:
+                await self._wait_turn(chat_id)
+            waited = False
+            try:
+                result = await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt == self.max_retries:
+                    raise
+                self.retried += 1
+                self.logger.warning(
+                    f"Flood control for chat {chat_id}, retrying in {e.retry_after}s"
+                )
+                self._chat_bucket(chat_id).pause(e.retry_after)
+                continue
+            self.sent += 1
+            return result
+
+    async def _wait_turn(self, chat_id: int | str | None) -> None:
+        if chat_id is not None:
+            await self._chat_bucket(chat_id).acquire()
+        # Global sends are handed out by priority, interactive replies first
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters, (self.priority.get(), next(self._counter), future)
+        )
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            await self.global_bucket.acquire()
+            while self._waiters:
+                _, _, future = heapq.heappop(self._waiters)
+                if not future.done():  # Skip callers that were cancelled
+                    future.set_result(None)
+                    break
+
+    def _chat_bucket(self, chat_id: int | str | None) -> TokenBucket:
+        if chat_id is None:
+            return self.global_bucket  # Inline messages only share the global limit
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            is_group = isinstance(chat_id, str) or chat_id < 0
+            bucket = (
+                TokenBucket(self.group_rate, self.group_rate * 60)
+                if is_group
+                else TokenBucket(self.chat_rate, self.chat_burst)
+            )
+        # TTLCache counts from insertion, re-inserting makes it last access
+        self.chat_buckets[chat_id] = bucket
+        return bucket
@@ -0,0 +1,3 @@
+from .cached_redis import CachedRedisStorage
+
+__all__ = ["CachedRedisStorage"]
@@ -0,0 +1,188 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Any, Mapping
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import (
+    DefaultKeyBuilder,
+    KeyBuilder,
+    StateType,
+    StorageKey,
+)
+from aiogram.fsm.storage.redis import RedisStorage
+from redis.asyncio import Redis
+
+
+def dumps(data: Mapping[str, Any]) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def text(value: bytes | str | None) -> str | None:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class CachedRedisStorage(RedisStorage):
+    def __init__(
+        self,
+        redis: Redis,
+        key_builder: KeyBuilder | None = None,
+        ttl: int | None = None,
+        local_cache_size: int = 10_000,
+        channel: str = "fsm:invalidate",
+    ) -> None:
+        # aiogram-dialog keeps its stacks under separate destinies
+        super().__init__(redis, key_builder or DefaultKeyBuilder(with_destiny=True))
+        self.ttl = ttl
+        self.local_cache_size = local_cache_size
+        self.channel = channel
+        self.instance_id = uuid.uuid4().hex
+        # Serialized data is cached so callers can never mutate a cached dict
+        self.local_cache: OrderedDict[str, tuple[str | None, str | None]] = (
+            OrderedDict()
+        )
+        self.subscribed = False
+        # Bumped by every invalidation of a key with reads in flight, a read
+        # that saw it change may hold a value from before the write
+        self.generations: dict[str, int] = dict()
+        self.readers: dict[str, int] = dict()
+        self.hits = 0
+        self.misses = 0
+        self._listener: asyncio.Task | None = None
+        self.logger = logging.getLogger(__name__)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        state = state.state if isinstance(state, State) else state
+        await self._write(self.key_builder.build(key), "state", state)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        state, _ = await self._read(self.key_builder.build(key))
+        return state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await self._write(
+            self.key_builder.build(key), "data", dumps(data) if data else None
+        )
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        _, data = await self._read(self.key_builder.build(key))
+        return json.loads(data) if data else {}
+
+    async def update_data(
+        self, key: StorageKey, data: Mapping[str, Any]
+    ) -> dict[str, Any]:
+        redis_key = self.key_builder.build(key)
+        _, current = await self._read(redis_key)
+        current_data = json.loads(current) if current else {}
+        current_data.update(data)
+        await self._write(
+            redis_key, "data", dumps(current_data) if current_data else None
+        )
+        return current_data
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await super().close()
+
+    @property
+    def caching(self) -> bool:
+        # Until the subscription is confirmed, invalidations could be missed
+        return bool(self.local_cache_size) and self.subscribed
+
+    async def _read(self, redis_key: str) -> tuple[str | None, str | None]:
+        self._ensure_listener()
+        if self.caching and redis_key in self.local_cache:
+            self.hits += 1
+            self.local_cache.move_to_end(redis_key)
+            return self.local_cache[redis_key]
+
+        self.misses += 1
+        generation = self._begin_read(redis_key)
+        try:
+            # State and data share one hash so a read is a single round-trip
+            values = {
+                text(field): text(value)
+                for field, value in (await self.redis.hgetall(redis_key)).items()
+            }
+        finally:
+            current = self._end_read(redis_key)
+        record = (values.get("state"), values.get("data"))
+        if self.caching and current == generation:
+            self._remember(redis_key, record)
+        return record
+
+    def _begin_read(self, redis_key: str) -> int:
+        self.readers[redis_key] = self.readers.get(redis_key, 0) + 1
+        return self.generations.setdefault(redis_key, 0)
+
+    def _end_read(self, redis_key: str) -> int:
+        generation = self.generations[redis_key]
+        self.readers[redis_key] -= 1
+        if not self.readers[redis_key]:
+            del self.readers[redis_key], self.generations[redis_key]
+        return generation
+
+    def _bump(self, redis_key: str) -> None:
+        if redis_key in self.generations:
+            self.generations[redis_key] += 1
+
+    async def _write(self, redis_key: str, field: str, value: str | None) -> None:
+        # Only the changed field is written, so a stale copy of the other one
+        # can never be put back
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if value is None:
+                pipe.hdel(redis_key, field)
+            else:
+                pipe.hset(redis_key, field, value)
+                if self.ttl is not None:
+                    pipe.expire(redis_key, self.ttl)
+            # Always published, other workers may cache even if this one doesn't
+            pipe.publish(self.channel, f"{self.instance_id}:{redis_key}")
+            await pipe.execute()
+
+        self._bump(redis_key)
+        record = self.local_cache.get(redis_key)
+        if record is not None and self.caching:
+            state, data = record
+            self._remember(
+                redis_key,
+                (value, data) if field == "state" else (state, value),
+            )
+
+    def _remember(self, redis_key: str, record: tuple[str | None, str | None]) -> None:
+        self.local_cache[redis_key] = record
+        self.local_cache.move_to_end(redis_key)
+        while len(self.local_cache) > self.local_cache_size:
+            self.local_cache.popitem(last=False)
+
+    def _ensure_listener(self) -> None:
+        if self.local_cache_size and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        pubsub = self.redis.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            async for message in pubsub.listen():
+                if message["type"] == "subscribe":
+                    self.subscribed = True
+                if message["type"] != "message":
+                    continue
+                instance_id, redis_key = text(message["data"]).split(":", 1)
+                if instance_id != self.instance_id:
+                    self.local_cache.pop(redis_key, None)
+                    self._bump(redis_key)
+        except Exception as e:
+            # Without invalidations the local cache could serve stale dialogs,
+            # so it stays off until the next read resubscribes
+            self.logger.error(f"FSM invalidation listener stopped: {e}")
+        finally:
+            self.subscribed = False
+            self.local_cache.clear()
+            self._listener = None
+            await pubsub.aclose()
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import secrets
+import signal
+import time
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiohttp import web
+from pydantic import ValidationError
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class WebhookServer:
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        secret_token: str | None,
+        path: str = "/webhook",
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        workers: int = 4,
+        queue_size: int = 1000,
+    ) -> None:
+        self.dispatcher = dispatcher
+        self.bot = bot
+        self.secret_token = secret_token
+        self.path = path
+        self.host = host
+        self.port = port
+        # One bounded queue per worker; updates are sharded by user so each
+        # user's updates are still handled in order
+        self.queues: list[asyncio.Queue[tuple[Update, float]]] = [
+            asyncio.Queue(maxsize=max(1, queue_size // workers)) for _ in range(workers)
+        ]
+        self.received = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+        self._workers: list[asyncio.Task] = []
+        self._stopped = asyncio.Event()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(queue.qsize() for queue in self.queues)
+
+    def stats(self) -> dict[str, float]:
+        handled = self.processed + self.failed
+        return {
+            "received": self.received,
+            "rejected": self.rejected,
+            "processed": self.processed,
+            "failed": self.failed,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_depth,
+            "queue_capacity": sum(queue.maxsize for queue in self.queues),
+            "average_wait": self.total_wait / handled if handled else 0.0,
+        }
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(self.path, self.handle)
+        # Without a secret there is nothing to authenticate stats with
+        if self.secret_token:
+            app.router.add_get(f"{self.path}/stats", self.handle_stats)
+        return app
+
+    def _authorized(self, request: web.Request) -> bool:
+        return not self.secret_token or secrets.compare_digest(
+            request.headers.get(SECRET_HEADER, ""), self.secret_token
+        )
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return web.Response(status=401)
+
+        try:
+            update = Update.model_validate_json(
+                await request.read(), context={"bot": self.bot}
+            )
+        except ValidationError:
+            return web.Response(status=400)
+        self.received += 1
+        queue = self.queues[self._shard(update)]
+        try:
+            queue.put_nowait((update, time.monotonic()))
+        except asyncio.QueueFull:
+            # Telegram redelivers on non-2xx, so a full queue pushes back upstream
+            self.rejected += 1
+            self.logger.warning(
+                f"Update queue full, rejected update {update.update_id}"
+            )
+            return web.Response(status=503)
+
+        self.max_depth = max(self.max_depth, self.queue_depth)
+        return web.Response()
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return web.Response(status=401)
+        return web.json_response(self.stats())
+
+    async def run(self) -> None:
+        await self.dispatcher.emit_startup(
+            bot=self.bot, **self.dispatcher.workflow_data
+        )
+        self._workers = [
+            asyncio.create_task(self._work(queue)) for queue in self.queues
+        ]
+
+        runner = web.AppRunner(self.create_app())
+        await runner.setup()
+        await web.TCPSite(runner, self.host, self.port).start()
+        self.logger.info(
+            f"Webhook listening on {self.host}:{self.port}{self.path} "
+            f"with {len(self._workers)} workers"
+        )
+        # docker stop sends SIGTERM, the accepted updates are drained first
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # No signal handlers on this platform or thread
+        try:
+            await self._stopped.wait()
+        finally:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                try:
+                    loop.remove_signal_handler(signum)
+                except (NotImplementedError, RuntimeError):
+                    pass
+            await runner.cleanup()  # Stop intake before draining what was accepted
+            await asyncio.gather(*(queue.join() for queue in self.queues))
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            await self.dispatcher.emit_shutdown(
+                bot=self.bot, **self.dispatcher.workflow_data
+            )
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _shard(self, update: Update) -> int:
+        try:
+            user = getattr(update.event, "from_user", None)
+        except LookupError:  # Update types newer than aiogram knows about
+            user = None
+        key = user.id if user is not None else update.update_id
+        return key % len(self.queues)
+
+    async def _work(self, queue: asyncio.Queue[tuple[Update, float]]) -> None:
+        while True:
+            update, received_at = await queue.get()
+            self.total_wait += time.monotonic() - received_at
+            try:
+                await self.dispatcher.feed_update(self.bot, update)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                self.logger.error(f"Failed to process update {update.update_id}: {e}")
+            finally:
+                queue.task_done()
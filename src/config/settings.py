@@ -1,4 +1,6 @@
-from pydantic import Field
+from typing import Literal, Self
+
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,3 +8,33 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
     bot_token: str = Field(alias="BOT_TOKEN")
     artifacts_token: str = Field(alias="ARTIFACTS_TOKEN")
+    artifacts_url: str = Field("https://api.artifactsmmo.com/", alias="ARTIFACTS_URL")
+    api_max_clients: int = Field(100, alias="API_MAX_CLIENTS")
+    api_client_idle_timeout: float = Field(600.0, alias="API_CLIENT_IDLE_TIMEOUT")
+    openapi_cache_dir: str = Field("./.cache/openapi", alias="OPENAPI_CACHE_DIR")
+    openapi_offline: bool = Field(False, alias="OPENAPI_OFFLINE")
+    openapi_snapshot: str | None = Field(None, alias="OPENAPI_SNAPSHOT")
+    prewarm_models: list[str] = Field(default_factory=list, alias="PREWARM_MODELS")
+    redis_url: str | None = Field(None, alias="REDIS_URL")
+    fsm_local_cache_size: int = Field(10_000, alias="FSM_LOCAL_CACHE_SIZE")
+    bot_mode: Literal["polling", "webhook"] = Field("polling", alias="BOT_MODE")
+    webhook_url: str | None = Field(None, alias="WEBHOOK_URL")
+    webhook_path: str = Field("/webhook", alias="WEBHOOK_PATH")
+    webhook_secret: str | None = Field(None, alias="WEBHOOK_SECRET")
+    webhook_host: str = Field("0.0.0.0", alias="WEBHOOK_HOST")
+    webhook_port: int = Field(8080, alias="WEBHOOK_PORT")
+    webhook_workers: int = Field(4, alias="WEBHOOK_WORKERS")
+    webhook_queue_size: int = Field(1000, alias="WEBHOOK_QUEUE_SIZE")
+    metrics_host: str = Field("0.0.0.0", alias="METRICS_HOST")
+    metrics_port: int | None = Field(None, alias="METRICS_PORT")
+
+    @model_validator(mode="after")
+    def check_webhook(self) -> Self:
+        if self.bot_mode != "webhook":
+            return self
+        if not self.webhook_url:
+            raise ValueError("WEBHOOK_URL is required when BOT_MODE is webhook")
+        # Without it anyone who finds the URL can post forged updates
+        if not self.webhook_secret:
+            raise ValueError("WEBHOOK_SECRET is required when BOT_MODE is webhook")
+        return self
@@ -0,0 +1,5 @@
+from .crafting import CraftingPlan, CraftingResolver
+from .map_index import MapIndex
+from .routing import Route, RoutePlanner
+
+__all__ = ["CraftingPlan", "CraftingResolver", "MapIndex", "Route", "RoutePlanner"]
@@ -0,0 +1,173 @@
+import hashlib
+import math
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from src.api.pagination import PageFetcher, fetch_all
+
+
+@dataclass(frozen=True)
+class Recipe:
+    code: str
+    skill: str
+    level: int
+    quantity: int  # Items produced by one craft
+    materials: tuple[tuple[str, int], ...]
+
+
+@dataclass
+class CraftingPlan:
+    code: str
+    quantity: int
+    raw_materials: dict[str, int] = field(default_factory=dict)
+    from_inventory: dict[str, int] = field(default_factory=dict)
+    from_bank: dict[str, int] = field(default_factory=dict)
+    crafts: list[tuple[str, int]] = field(default_factory=list)
+    skills: dict[str, int] = field(default_factory=dict)
+    workshops: list[str] = field(default_factory=list)
+
+
+def recipe_of(item: Any) -> Recipe | None:
+    craft = getattr(item, "craft", None)
+    if craft is None or not craft.items:
+        return None
+    skill = getattr(craft.skill, "value", craft.skill)
+    return Recipe(
+        item.code,
+        str(skill),
+        craft.level or 0,
+        craft.quantity or 1,
+        tuple(sorted((material.code, material.quantity) for material in craft.items)),
+    )
+
+
+class CraftingResolver:
+    def __init__(self, items: Iterable[Any]) -> None:
+        self.recipes: dict[str, Recipe] = dict()
+        self.catalogue_hash = ""
+        self._orders: dict[str, tuple[str, ...]] = dict()
+        self.update(items)
+
+    @classmethod
+    async def load(cls, fetch_page: PageFetcher, **params: Any) -> "CraftingResolver":
+        return cls(await fetch_all(fetch_page, **params))
+
+    def update(self, items: Iterable[Any]) -> bool:
+        recipes = {
+            recipe.code: recipe
+            for recipe in map(recipe_of, items)
+            if recipe is not None
+        }
+        catalogue_hash = hashlib.blake2b(
+            repr(sorted(recipes.values(), key=lambda recipe: recipe.code)).encode(),
+            digest_size=16,
+        ).hexdigest()
+        if catalogue_hash == self.catalogue_hash:
+            return False  # Same catalogue, memoized expansions stay valid
+
+        self.recipes = recipes
+        self.catalogue_hash = catalogue_hash
+        self._orders.clear()
+        return True
+
+    def order(self, code: str) -> tuple[str, ...]:
+        # Every item in the recipe tree, each one before its own materials
+        if code not in self._orders:
+            visited: set[str] = set()
+            visiting: set[str] = set()
+            post_order: list[str] = []
+
+            def visit(item: str) -> None:
+                if item in visited:
+                    return
+                if item in visiting:
+                    raise ValueError(f"Recipe cycle through {item}")
+                visiting.add(item)
+                recipe = self.recipes.get(item)
+                for material, _ in recipe.materials if recipe else ():
+                    visit(material)
+                visiting.discard(item)
+                visited.add(item)
+                post_order.append(item)
+
+            visit(code)
+            self._orders[code] = tuple(reversed(post_order))
+        return self._orders[code]
+
+    def plan(
+        self,
+        code: str,
+        quantity: int = 1,
+        inventory: dict[str, int] | None = None,
+        bank: dict[str, int] | None = None,
+    ) -> CraftingPlan:
+        inventory = dict(inventory or dict())
+        bank = dict(bank or dict())
+        plan = CraftingPlan(code, quantity)
+        needed = {code: quantity}
+        crafts = dict()
+
+        # Parents come first, so an item's full demand is known before it is
+        # split into stock on hand, stock in the bank and crafts
+        for item in self.order(code):
+            remaining = needed.pop(item, 0)
+            if not remaining:
+                continue
+            for stock, used in (
+                (inventory, plan.from_inventory),
+                (bank, plan.from_bank),
+            ):
+                taken = min(stock.get(item, 0), remaining)
+                if taken:
+                    stock[item] -= taken
+                    used[item] = used.get(item, 0) + taken
+                    remaining -= taken
+            if not remaining:
+                continue
+
+            recipe = self.recipes.get(item)
+            if recipe is None:
+                plan.raw_materials[item] = remaining
+                continue
+            crafts[item] = math.ceil(remaining / recipe.quantity)
+            plan.skills[recipe.skill] = max(
+                plan.skills.get(recipe.skill, 0), recipe.level
+            )
+            for material, material_quantity in recipe.materials:
+                needed[material] = (
+                    needed.get(material, 0) + crafts[item] * material_quantity
+                )
+
+        plan.crafts = self._schedule(crafts)
+        for item, _ in plan.crafts:
+            skill = self.recipes[item].skill
+            if not plan.workshops or plan.workshops[-1] != skill:
+                plan.workshops.append(skill)
+        return plan
+
+    def _schedule(self, crafts: dict[str, int]) -> list[tuple[str, int]]:
+        # Materials first, staying at the current workshop while anything
+        # ready can be crafted there
+        waiting_on = {
+            item: {
+                material
+                for material, _ in self.recipes[item].materials
+                if material in crafts
+            }
+            for item in crafts
+        }
+        schedule = []
+        skill = None
+        while waiting_on:
+            ready = sorted(
+                item for item, materials in waiting_on.items() if not materials
+            )
+            item = next(
+                (item for item in ready if self.recipes[item].skill == skill), ready[0]
+            )
+            skill = self.recipes[item].skill
+            schedule.append((item, crafts[item]))
+            del waiting_on[item]
+            for materials in waiting_on.values():
+                materials.discard(item)
+        return schedule
@@ -0,0 +1,190 @@
+import heapq
+from array import array
+from typing import Any, Iterable
+
+from src.api.pagination import PageFetcher, fetch_all
+
+Position = tuple[int, int]
+
+
+def manhattan(a: Position, b: Position) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class MapIndex:
+    def __init__(self, maps: Iterable[Any], bucket_size: int = 4) -> None:
+        self.bucket_size = bucket_size
+        self.codes: list[str | None] = [None]  # Content id 0 is an empty tile
+        self.code_ids: dict[str, int] = {}
+        self.content_types: dict[str, str] = {}
+        self.codes_by_type: dict[str, set[str]] = {}
+        self._buckets: dict[str, dict[Position, set[Position]]] = {}
+
+        tiles = {(map_schema.x, map_schema.y): map_schema for map_schema in maps}
+        self._allocate(tiles.keys())
+        for map_schema in tiles.values():
+            self.update(map_schema)
+
+    @classmethod
+    async def load(cls, fetch_page: PageFetcher, **params: Any) -> "MapIndex":
+        return cls(await fetch_all(fetch_page, **params))
+
+    def content_at(self, x: int, y: int) -> str | None:
+        offset = self._offset(x, y)
+        return None if offset is None else self.codes[self.grid[offset]]
+
+    def positions(self, code: str) -> list[Position]:
+        return [
+            position
+            for bucket in self._buckets.get(code, {}).values()
+            for position in bucket
+        ]
+
+    def update(self, map_schema: Any) -> None:
+        content = self._content_of(map_schema)
+        if content is None:
+            self.set_content(map_schema.x, map_schema.y, None)
+        else:
+            self.set_content(map_schema.x, map_schema.y, content.code, content.type)
+
+    def set_content(
+        self, x: int, y: int, code: str | None, content_type: str | None = None
+    ) -> None:
+        if self._offset(x, y) is None:
+            self._allocate([*self._tiles(), (x, y)])
+
+        previous = self.content_at(x, y)
+        if previous is not None:
+            bucket = self._buckets[previous][self._bucket(x, y)]
+            bucket.discard((x, y))
+            if not bucket:
+                del self._buckets[previous][self._bucket(x, y)]
+
+        if code is None:
+            self.grid[self._offset(x, y)] = 0
+            return
+
+        if code not in self.code_ids:
+            self.code_ids[code] = len(self.codes)
+            self.codes.append(code)
+        if content_type is not None:
+            self.content_types[code] = str(content_type)
+            self.codes_by_type.setdefault(str(content_type), set()).add(code)
+
+        self.grid[self._offset(x, y)] = self.code_ids[code]
+        self._buckets.setdefault(code, {}).setdefault(self._bucket(x, y), set()).add(
+            (x, y)
+        )
+
+    def nearest(self, code: str, x: int, y: int, k: int = 1) -> list[Position]:
+        buckets = self._buckets.get(code)
+        if not buckets or k < 1:
+            return []
+
+        best: list[tuple[int, Position]] = []  # Max-heap of the k closest so far
+        center_x, center_y = self._bucket(x, y)
+        for ring in range(self._max_ring(center_x, center_y) + 1):
+            for cell in self._ring(center_x, center_y, ring):
+                for position in buckets.get(cell, ()):
+                    item = (-manhattan((x, y), position), position)
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+
+            # Tiles outside this ring are at least ring * bucket_size + 1 away
+            if len(best) == k and -best[0][0] <= ring * self.bucket_size + 1:
+                break
+
+        return [position for _, position in sorted(best, reverse=True)]
+
+    def within(self, code: str, x: int, y: int, radius: int) -> list[Position]:
+        buckets = self._buckets.get(code)
+        if not buckets:
+            return []
+
+        center_x, center_y = self._bucket(x, y)
+        rings = -(-radius // self.bucket_size)
+        return sorted(
+            (
+                position
+                for ring in range(rings + 1)
+                for cell in self._ring(center_x, center_y, ring)
+                for position in buckets.get(cell, ())
+                if manhattan((x, y), position) <= radius
+            ),
+            key=lambda position: manhattan((x, y), position),
+        )
+
+    def nearest_of_type(
+        self, content_type: str, x: int, y: int
+    ) -> tuple[str, Position] | None:
+        candidates = [
+            (manhattan((x, y), position), code, position)
+            for code in self.codes_by_type.get(content_type, ())
+            for position in self.nearest(code, x, y)
+        ]
+        if not candidates:
+            return None
+        _, code, position = min(candidates)
+        return code, position
+
+    @staticmethod
+    def _content_of(map_schema: Any) -> Any:
+        content = getattr(map_schema, "content", None)
+        if content is None:  # Newer API versions nest content under interactions
+            interactions = getattr(map_schema, "interactions", None)
+            content = getattr(interactions, "content", None)
+        return content
+
+    def _allocate(self, tiles: Iterable[Position]) -> None:
+        tiles = list(tiles) or [(0, 0)]
+        previous = {
+            position: self.content_at(*position)
+            for position in (self._tiles() if hasattr(self, "grid") else [])
+        }
+        self.min_x = min(x for x, _ in tiles)
+        self.min_y = min(y for _, y in tiles)
+        self.width = max(x for x, _ in tiles) - self.min_x + 1
+        self.height = max(y for _, y in tiles) - self.min_y + 1
+        self.grid = array("H", bytes(2 * self.width * self.height))
+        for (x, y), code in previous.items():
+            if code is not None:
+                self.grid[self._offset(x, y)] = self.code_ids[code]
+
+    def _tiles(self) -> list[Position]:
+        return [
+            (self.min_x + x, self.min_y + y)
+            for y in range(self.height)
+            for x in range(self.width)
+        ]
+
+    def _offset(self, x: int, y: int) -> int | None:
+        column, row = x - self.min_x, y - self.min_y
+        if 0 <= column < self.width and 0 <= row < self.height:
+            return row * self.width + column
+        return None
+
+    def _bucket(self, x: int, y: int) -> Position:
+        return x // self.bucket_size, y // self.bucket_size
+
+    def _max_ring(self, center_x: int, center_y: int) -> int:
+        low_x, low_y = self._bucket(self.min_x, self.min_y)
+        high_x, high_y = self._bucket(
+            self.min_x + self.width - 1, self.min_y + self.height - 1
+        )
+        return max(
+            center_x - low_x, high_x - center_x, center_y - low_y, high_y - center_y, 0
+        )
+
+    @staticmethod
+    def _ring(center_x: int, center_y: int, ring: int) -> Iterable[Position]:
+        if ring == 0:
+            yield center_x, center_y
+            return
+        for dx in range(-ring, ring + 1):
+            yield center_x + dx, center_y - ring
+            yield center_x + dx, center_y + ring
+        for dy in range(-ring + 1, ring):
+            yield center_x - ring, center_y + dy
+            yield center_x + ring, center_y + dy
@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+from itertools import combinations
+
+from src.game.map_index import Position, manhattan
+
+
+@dataclass
+class Route:
+    stops: list[Position]
+    cooldown: float
+
+
+class RoutePlanner:
+    def __init__(self, seconds_per_tile: float = 5.0, exact_limit: int = 10) -> None:
+        self.seconds_per_tile = seconds_per_tile
+        self.exact_limit = exact_limit  # Above this many stops use a heuristic
+        self._costs: dict[tuple[Position, Position], float] = {}
+
+    def travel_cost(self, start: Position, end: Position) -> float:
+        key = (start, end) if start <= end else (end, start)
+        cost = self._costs.get(key)
+        if cost is None:
+            cost = self._costs[key] = manhattan(start, end) * self.seconds_per_tile
+        return cost
+
+    def plan(
+        self, start: Position, stops: list[Position], end: Position | None = None
+    ) -> Route:
+        stops = list(dict.fromkeys(stops))  # Visiting a tile twice never helps
+        if len(stops) <= self.exact_limit:
+            order = self._held_karp(start, stops, end)
+        else:
+            order = self._two_opt(start, self._nearest_neighbour(start, stops), end)
+        return Route(order, self._route_cost(start, order, end))
+
+    def _route_cost(
+        self, start: Position, order: list[Position], end: Position | None
+    ) -> float:
+        path = [start, *order] + ([end] if end is not None else [])
+        return sum(self.travel_cost(a, b) for a, b in zip(path, path[1:]))
+
+    def _held_karp(
+        self, start: Position, stops: list[Position], end: Position | None
+    ) -> list[Position]:
+        if not stops:
+            return []
+
+        # best[(visited mask, last stop)] = (cost, previous stop)
+        best: dict[tuple[int, int], tuple[float, int]] = {
+            (1 << i, i): (self.travel_cost(start, stop), -1)
+            for i, stop in enumerate(stops)
+        }
+        for size in range(2, len(stops) + 1):
+            for subset in combinations(range(len(stops)), size):
+                mask = sum(1 << i for i in subset)
+                for last in subset:
+                    previous_mask = mask & ~(1 << last)
+                    best[(mask, last)] = min(
+                        (
+                            best[(previous_mask, previous)][0]
+                            + self.travel_cost(stops[previous], stops[last]),
+                            previous,
+                        )
+                        for previous in subset
+                        if previous != last
+                    )
+
+        full_mask = (1 << len(stops)) - 1
+        _, last = min(
+            (
+                best[(full_mask, last)][0]
+                + (self.travel_cost(stops[last], end) if end is not None else 0.0),
+                last,
+            )
+            for last in range(len(stops))
+        )
+
+        order = []
+        mask = full_mask
+        while last != -1:
+            order.append(stops[last])
+            mask, last = mask & ~(1 << last), best[(mask, last)][1]
+        return order[::-1]
+
+    def _nearest_neighbour(
+        self, start: Position, stops: list[Position]
+    ) -> list[Position]:
+        remaining = set(stops)
+        order = []
+        current = start
+        while remaining:
+            current = min(
+                remaining, key=lambda stop: (self.travel_cost(current, stop), stop)
+            )
+            remaining.remove(current)
+            order.append(current)
+        return order
+
+    def _two_opt(
+        self, start: Position, order: list[Position], end: Position | None
+    ) -> list[Position]:
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(order) - 1):
+                for j in range(i + 1, len(order)):
+                    candidate = order[:i] + order[i : j + 1][::-1] + order[j + 1 :]
+                    if self._route_cost(start, candidate, end) < self._route_cost(
+                        start, order, end
+                    ):
+                        order = candidate
+                        improved = True
+        return order
@@ -0,0 +1,15 @@
+from .client import ClientMetrics
+from .registry import Counter, Gauge, Histogram, MetricsRegistry
+from .server import serve_metrics
+
+__all__ = [
+    "ClientMetrics",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "registry",
+    "serve_metrics",
+]
+
+registry = MetricsRegistry()
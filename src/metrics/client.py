@@ -0,0 +1,93 @@
+import re
+from functools import lru_cache
+from typing import Any
+from urllib.parse import urlsplit
+
+from src.metrics.registry import MetricsRegistry
+
+BREAKER_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+# Character names and coordinates would give every character its own series
+ENDPOINT_PATTERNS = (
+    (re.compile(r"^my/[^/]+/"), "my/{name}/"),
+    (re.compile(r"^characters/(?!create$|delete$)[^/]+"), "characters/{name}"),
+    (re.compile(r"/-?\d+(?=/|$)"), "/{n}"),
+)
+
+
+@lru_cache(maxsize=4096)
+def endpoint_label(url: str, base_path: str = "/") -> str:
+    path = urlsplit(url).path.removeprefix(base_path).strip("/")
+    for pattern, replacement in ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+class ClientMetrics:
+    def __init__(self, registry: MetricsRegistry, base_path: str = "/") -> None:
+        self.base_path = base_path
+        self.duration = registry.histogram(
+            "artifacts_request_duration_seconds",
+            "ArtifactsMMO request latency, including requeues after 429",
+            ("method", "endpoint"),
+        )
+        self.responses = registry.counter(
+            "artifacts_responses_total",
+            "ArtifactsMMO responses by status code, 0 for transport errors",
+            ("method", "endpoint", "status"),
+        )
+        self.response_bytes = registry.counter(
+            "artifacts_response_bytes_total",
+            "ArtifactsMMO response body bytes",
+            ("method", "endpoint"),
+        )
+        self.requeues = registry.counter(
+            "artifacts_requeues_total",
+            "ArtifactsMMO requests requeued after a 429",
+            ("method", "endpoint"),
+        )
+        self.retries = registry.counter(
+            "artifacts_retries_total",
+            "ArtifactsMMO requests retried after an error or 5xx",
+            ("method", "endpoint"),
+        )
+        self.breaker_state = registry.gauge(
+            "artifacts_circuit_state",
+            "Circuit breaker state per host: 0 closed, 1 half open, 2 open",
+            ("host",),
+        )
+        self.decode_duration = registry.histogram(
+            "artifacts_decode_duration_seconds",
+            "Time spent validating response bodies",
+            ("model",),
+            (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05),
+        )
+
+    def on_response(
+        self,
+        method: str,
+        url: str,
+        status_code: int,
+        elapsed: float,
+        size: int,
+        requeues: int,
+    ) -> None:
+        endpoint = endpoint_label(url, self.base_path)
+        self.duration.observe(elapsed, method, endpoint)
+        self.responses.inc(method, endpoint, str(status_code))
+        self.response_bytes.inc(method, endpoint, amount=size)
+        if requeues:
+            self.requeues.inc(method, endpoint, amount=requeues)
+
+    def on_decode(self, response_model: Any, elapsed: float) -> None:
+        if response_model is None:
+            model = "json"
+        else:
+            model = getattr(response_model, "__name__", None) or str(response_model)
+        self.decode_duration.observe(elapsed, model)
+
+    def on_retry(self, method: str, url: str) -> None:
+        self.retries.inc(method, endpoint_label(url, self.base_path))
+
+    def on_breaker(self, host: str, state: str) -> None:
+        self.breaker_state.set(BREAKER_STATES[state], host)
@@ -0,0 +1,119 @@
+from bisect import bisect_left
+
+Labels = tuple[str, ...]
+
+
+def escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: Labels, values: Labels) -> str:
+    if not names:
+        return ""
+    return (
+        "{"
+        + ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+        + "}"
+    )
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Labels = ()) -> None:
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.values: dict[Labels, float] = dict()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{format_labels(self.labels, label_values)} {value}"
+            for label_values, value in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, *label_values: str) -> None:
+        self.values[label_values] = value
+
+
+class Histogram:
+    kind = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Labels = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = buckets
+        # Per label set: a count for each bucket plus +Inf, and the sum
+        self.values: dict[Labels, tuple[list[int], list[float]]] = dict()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        if label_values not in self.values:
+            self.values[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = self.values[label_values]
+        # Counts stay per bucket and are only accumulated when rendered
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def samples(self) -> list[str]:
+        samples = []
+        for label_values, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                labels = format_labels(
+                    (*self.labels, "le"), (*label_values, str(bound))
+                )
+                samples.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.labels, label_values)
+            samples.append(f"{self.name}_sum{labels} {total[0]}")
+            samples.append(f"{self.name}_count{labels} {cumulative}")
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.metrics: dict[str, Counter | Gauge | Histogram] = dict()
+
+    def counter(self, name: str, description: str, labels: Labels = ()) -> Counter:
+        if name not in self.metrics:
+            self.metrics[name] = Counter(name, description, labels)
+        return self.metrics[name]
+
+    def gauge(self, name: str, description: str, labels: Labels = ()) -> Gauge:
+        if name not in self.metrics:
+            self.metrics[name] = Gauge(name, description, labels)
+        return self.metrics[name]
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labels: Labels = (),
+        buckets: tuple[float, ...] = Histogram.DEFAULT_BUCKETS,
+    ) -> Histogram:
+        if name not in self.metrics:
+            self.metrics[name] = Histogram(name, description, labels, buckets)
+        return self.metrics[name]
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,30 @@
+import logging
+
+from aiohttp import web
+
+from src.metrics.registry import MetricsRegistry
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+logger = logging.getLogger(__name__)
+
+
+def metrics_handler(registry: MetricsRegistry):
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(
+            body=registry.render().encode(), headers={"Content-Type": CONTENT_TYPE}
+        )
+
+    return handle
+
+
+async def serve_metrics(
+    registry: MetricsRegistry, host: str = "0.0.0.0", port: int = 9100
+) -> web.AppRunner:
+    app = web.Application()
+    app.router.add_get("/metrics", metrics_handler(registry))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"Serving metrics on {host}:{port}/metrics")
+    return runner
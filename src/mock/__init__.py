@@ -0,0 +1,5 @@
+from .faker import SchemaFaker
+from .server import MockServer
+from .world import MockError, MockWorld
+
+__all__ = ["MockError", "MockServer", "MockWorld", "SchemaFaker"]
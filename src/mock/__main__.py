@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+import json
+import logging
+
+from src.mock import MockServer
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a mock ArtifactsMMO API")
+    parser.add_argument("spec", help="Path to openapi.json")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, nargs=2, default=(0.0, 0.0))
+    parser.add_argument("--cooldown", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--no-rate-limits", action="store_true")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with open(args.spec) as f:
+        openapi = json.load(f)
+    server = MockServer(
+        openapi,
+        latency=tuple(args.latency),
+        cooldown=args.cooldown,
+        rate_limits=dict() if args.no_rate_limits else None,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    await server.start(args.host, args.port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
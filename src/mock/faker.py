@@ -0,0 +1,98 @@
+import random
+import string
+from datetime import datetime, timezone
+from typing import Any
+
+from src.api.generators.object_parser import ObjectParser
+from src.api.generators.type_resolver import resolve_reference
+
+
+def split_union(type_name: str) -> list[str]:
+    options, depth, start = [], 0, 0
+    for i, char in enumerate(type_name):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            options.append(type_name[start:i].strip())
+            start = i + 1
+    options.append(type_name[start:].strip())
+    return options
+
+
+class SchemaFaker:
+    MAX_DEPTH = 6
+
+    def __init__(
+        self,
+        openapi: dict[str, Any],
+        seed: int | None = None,
+        list_size: int = 2,
+        object_parser: ObjectParser | None = None,
+    ) -> None:
+        # Types are resolved with the generator's parser, so faked data has
+        # exactly the shape the generated models validate
+        self.object_parser = object_parser or ObjectParser()
+        self.schemas = {
+            resolve_reference(f"#/components/schemas/{name}")[1]: schema
+            for name, schema in openapi.get("components", {}).get("schemas", {}).items()
+        }
+        self.random = random.Random(seed)
+        self.list_size = list_size
+        self._properties: dict[str, list[tuple[str, str, str | None]]] = dict()
+
+    def type_of(self, schema: dict[str, Any]) -> str:
+        return self.object_parser.make_type(schema)[1]
+
+    def properties(self, type_name: str) -> list[tuple[str, str, str | None]]:
+        if type_name not in self._properties:
+            schema = self.schemas.get(type_name, {})
+            self._properties[type_name] = [
+                (name, self.type_of(prop), prop.get("format"))
+                for name, prop in schema.get("properties", {}).items()
+            ]
+        return self._properties[type_name]
+
+    def fake(self, schema: dict[str, Any]) -> Any:
+        return self.fake_type(self.type_of(schema))
+
+    def fake_type(
+        self, type_name: str, value_format: str | None = None, depth: int = 0
+    ) -> Any:
+        options = split_union(type_name)
+        if len(options) > 1:
+            options = [option for option in options if option != "None"]
+            if not options or depth >= self.MAX_DEPTH:
+                return None
+            return self.fake_type(options[0], value_format, depth)
+
+        if type_name.startswith("list["):
+            size = self.list_size if depth < self.MAX_DEPTH else 0
+            return [
+                self.fake_type(type_name[5:-1], value_format, depth + 1)
+                for _ in range(size)
+            ]
+        match type_name:
+            case "str" if value_format == "date-time":
+                return datetime.now(timezone.utc).isoformat()
+            case "str":
+                return "".join(self.random.choices(string.ascii_lowercase, k=8))
+            case "int":
+                return self.random.randint(0, 100)
+            case "bool":
+                return self.random.random() < 0.5
+            case "datetime":
+                return datetime.now(timezone.utc).isoformat()
+            case "list":
+                return []
+            case "None" | "Any":
+                return None
+
+        schema = self.schemas.get(type_name, {})
+        if "enum" in schema:
+            return self.random.choice(schema["enum"])
+        return {
+            name: self.fake_type(prop_type, prop_format, depth + 1)
+            for name, prop_type, prop_format in self.properties(type_name)
+        }
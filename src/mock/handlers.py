@@ -0,0 +1,64 @@
+from typing import Any, Awaitable, Callable
+
+from src.mock.world import MockError, MockWorld
+
+# Handlers receive the world, the character from the path, the request body and
+# the faked response, which they update in place
+Handler = Callable[[MockWorld, str | None, Any, dict[str, Any]], Awaitable[None]]
+
+
+def items_of(payload: Any) -> list[dict[str, Any]]:
+    return payload if isinstance(payload, list) else [payload]
+
+
+async def move(
+    world: MockWorld, name: str | None, payload: Any, body: dict[str, Any]
+) -> None:
+    character = world.character(name)
+    destination = (payload["x"], payload["y"])
+    if (character["x"], character["y"]) == destination:
+        raise MockError(490, "Character already at destination.")
+    character["x"], character["y"] = destination
+    if isinstance(body["data"].get("destination"), dict):
+        body["data"]["destination"].update(x=destination[0], y=destination[1])
+
+
+async def gather(
+    world: MockWorld, name: str | None, payload: Any, body: dict[str, Any]
+) -> None:
+    world.add_item(name, world.gather_item, 1)
+    details = body["data"].get("details")
+    if isinstance(details, dict):
+        details["items"] = [{"code": world.gather_item, "quantity": 1}]
+
+
+async def deposit_item(
+    world: MockWorld, name: str | None, payload: Any, body: dict[str, Any]
+) -> None:
+    for item in items_of(payload):
+        world.remove_item(name, item["code"], item["quantity"])
+        world.bank[item["code"]] = world.bank.get(item["code"], 0) + item["quantity"]
+    body["data"]["bank"] = world.bank_items()
+
+
+async def withdraw_item(
+    world: MockWorld, name: str | None, payload: Any, body: dict[str, Any]
+) -> None:
+    for item in items_of(payload):
+        if world.bank.get(item["code"], 0) < item["quantity"]:
+            raise MockError(478, "Missing item or insufficient quantity.")
+    for item in items_of(payload):
+        world.add_item(name, item["code"], item["quantity"])
+        world.bank[item["code"]] -= item["quantity"]
+        if not world.bank[item["code"]]:
+            del world.bank[item["code"]]
+    body["data"]["bank"] = world.bank_items()
+
+
+# Keyed by the method names of the generated endpoint classes
+DEFAULT_HANDLERS: dict[str, Handler] = {
+    "action_move": move,
+    "action_gathering": gather,
+    "action_deposit_bank_item": deposit_item,
+    "action_withdraw_bank_item": withdraw_item,
+}
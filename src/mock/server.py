@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import math
+import random
+from functools import partial
+from typing import Any
+
+from aiohttp import web
+
+from src.api.generators.type_resolver import camel_to_snake
+from src.api.rate_limiter import RateLimiter
+from src.mock.faker import SchemaFaker
+from src.mock.handlers import DEFAULT_HANDLERS, Handler
+from src.mock.world import MockError, MockWorld
+
+
+def error_response(status: int, message: str, **headers: str) -> web.Response:
+    return web.json_response(
+        {"error": {"code": status, "message": message}}, status=status, headers=headers
+    )
+
+
+class MockServer:
+    def __init__(
+        self,
+        openapi: dict[str, Any],
+        handlers: dict[str, Handler] | None = None,
+        latency: tuple[float, float] = (0.0, 0.0),
+        cooldown: float = 5.0,
+        rate_limits: dict[str, tuple[float, float]] | None = None,
+        error_rate: float = 0.0,
+        page_total: int = 100,
+        seed: int | None = None,
+    ) -> None:
+        self.openapi = openapi
+        self.faker = SchemaFaker(openapi, seed)
+        self.world = MockWorld(self.faker)
+        self.handlers = {**DEFAULT_HANDLERS, **(handlers or dict())}
+        self.latency = latency
+        self.cooldown = cooldown
+        # Limits mirror the live API by default; an empty dict disables them
+        self.rate_limiter = RateLimiter(rate_limits) if rate_limits != {} else None
+        self.error_rate = error_rate
+        self.page_total = page_total
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.statuses: dict[int, int] = dict()
+        self._runner: web.AppRunner | None = None
+        self.logger = logging.getLogger(__name__)
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/openapi.json", self.handle_openapi)
+        for path, methods in self.openapi.get("paths", {}).items():
+            for http_method, endpoint in methods.items():
+                content = (
+                    endpoint.get("responses", {}).get("200", {}).get("content", {})
+                )
+                schema = content.get("application/json", {}).get("schema")
+                app.router.add_route(
+                    http_method.upper(),
+                    path,
+                    partial(
+                        self.handle,
+                        path,
+                        camel_to_snake(endpoint.get("summary", path)),
+                        self.faker.type_of(schema) if schema else None,
+                    ),
+                )
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.logger.info(f"Mock server listening on {host}:{port}")
+        return f"http://{host}:{port}/"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle_openapi(self, request: web.Request) -> web.Response:
+        return web.json_response(self.openapi)
+
+    async def handle(
+        self,
+        path: str,
+        operation: str,
+        response_type: str | None,
+        request: web.Request,
+    ) -> web.Response:
+        response = await self._respond(path, operation, response_type, request)
+        self.requests += 1
+        self.statuses[response.status] = self.statuses.get(response.status, 0) + 1
+        return response
+
+    async def _respond(
+        self,
+        path: str,
+        operation: str,
+        response_type: str | None,
+        request: web.Request,
+    ) -> web.Response:
+        if self.latency[1]:
+            await asyncio.sleep(self.random.uniform(*self.latency))
+
+        if self.rate_limiter is not None:
+            bucket = self.rate_limiter.bucket_for(request.method, path)
+            if not bucket.try_acquire():
+                retry_after = (1 - bucket.tokens) / bucket.rate
+                return error_response(
+                    429, "Too many requests.", **{"Retry-After": f"{retry_after:.3f}"}
+                )
+        if self.error_rate and self.random.random() < self.error_rate:
+            return error_response(429, "Too many requests.", **{"Retry-After": "1"})
+
+        name = request.match_info.get("name")
+        is_action = request.method == "POST" and "/action/" in path and name
+        if is_action and (remaining := self.world.cooldown_remaining(name)):
+            return error_response(
+                499, f"Character in cooldown: {remaining:.2f} seconds left."
+            )
+
+        payload = await request.json() if request.can_read_body else None
+        body = self.faker.fake_type(response_type) if response_type else dict()
+        if isinstance(body, dict) and "pages" in body:
+            self._paginate(request, response_type, body)
+
+        try:
+            if operation in self.handlers:
+                await self.handlers[operation](self.world, name, payload, body)
+        except MockError as e:
+            return error_response(e.status, e.message)
+
+        data = body.get("data") if isinstance(body, dict) else None
+        if is_action and isinstance(data, dict):
+            # The faked cooldown keeps a valid reason from the spec's enum
+            data["cooldown"] = {
+                **(data.get("cooldown") or dict()),
+                **self.world.start_cooldown(name, self.cooldown),
+            }
+            if "character" in data:
+                data["character"] = self.world.character(name)
+        return web.json_response(body)
+
+    def _paginate(
+        self, request: web.Request, response_type: str, body: dict[str, Any]
+    ) -> None:
+        page = int(request.query.get("page", 1))
+        size = int(request.query.get("size", 50))
+        item_type = dict(
+            (name, prop_type)
+            for name, prop_type, _ in self.faker.properties(response_type)
+        ).get("data", "list[Any]")
+        count = max(min(size, self.page_total - (page - 1) * size), 0)
+        body.update(
+            data=[self.faker.fake_type(item_type[5:-1]) for _ in range(count)],
+            total=self.page_total,
+            page=page,
+            size=size,
+            pages=math.ceil(self.page_total / size),
+        )
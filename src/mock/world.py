@@ -0,0 +1,82 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from src.mock.faker import SchemaFaker
+
+
+class MockError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class MockWorld:
+    def __init__(self, faker: SchemaFaker, gather_item: str = "copper_ore") -> None:
+        self.faker = faker
+        self.gather_item = gather_item
+        self.characters: dict[str, dict[str, Any]] = dict()
+        self.bank: dict[str, int] = dict()
+        self.ready_at: dict[str, float] = dict()
+
+    def character(self, name: str) -> dict[str, Any]:
+        if name not in self.characters:
+            character = self.faker.fake_type("CharacterSchema")
+            character.update(
+                name=name, x=0, y=0, cooldown=0, inventory_max_items=100, hp=100
+            )
+            for slot in character.get("inventory", []):
+                slot.update(code="", quantity=0)
+            self.characters[name] = character
+        return self.characters[name]
+
+    def cooldown_remaining(self, name: str) -> float:
+        return max(self.ready_at.get(name, 0.0) - time.monotonic(), 0.0)
+
+    def start_cooldown(self, name: str, seconds: float) -> dict[str, Any]:
+        self.ready_at[name] = time.monotonic() + seconds
+        started_at = datetime.now(timezone.utc)
+        expiration = (started_at + timedelta(seconds=seconds)).isoformat()
+        character = self.character(name)
+        character.update(cooldown=round(seconds), cooldown_expiration=expiration)
+        return {
+            "total_seconds": round(seconds),
+            "remaining_seconds": round(seconds),
+            "started_at": started_at.isoformat(),
+            "expiration": expiration,
+        }
+
+    def add_item(self, name: str, code: str, quantity: int) -> None:
+        character = self.character(name)
+        inventory = character.setdefault("inventory", [])
+        if sum(slot["quantity"] for slot in inventory) + quantity > character.get(
+            "inventory_max_items", 100
+        ):
+            raise MockError(497, "Character inventory is full.")
+
+        for slot in inventory:
+            if slot["code"] == code:
+                slot["quantity"] += quantity
+                return
+        for slot in inventory:
+            if not slot["code"]:
+                slot.update(code=code, quantity=quantity)
+                return
+        inventory.append(
+            {"slot": len(inventory) + 1, "code": code, "quantity": quantity}
+        )
+
+    def remove_item(self, name: str, code: str, quantity: int) -> None:
+        for slot in self.character(name).get("inventory", []):
+            if slot["code"] == code and slot["quantity"] >= quantity:
+                slot["quantity"] -= quantity
+                if not slot["quantity"]:
+                    slot["code"] = ""
+                return
+        raise MockError(478, "Missing item or insufficient quantity.")
+
+    def bank_items(self) -> list[dict[str, Any]]:
+        return [
+            {"code": code, "quantity": quantity} for code, quantity in self.bank.items()
+        ]